@@ -3,14 +3,20 @@ Binance Public API Client
 Handles cryptocurrency data (free, no API key required)
 Covers ALL major cryptocurrencies including BNB, XRP, TON, TRX, etc.
 """
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict
 import time
+import heapq
+import numpy as np
+import json_codec
+import http_utils
+import ttl_cache
+import config
 
 class BinanceClient:
     def __init__(self):
         self.base_url = 'https://api.binance.com/api/v3'
+        self.session = http_utils.create_session()
         self._symbols_cache = None
     
     def get_all_symbols(self) -> List[str]:
@@ -23,9 +29,9 @@ class BinanceClient:
         
         try:
             url = f"{self.base_url}/exchangeInfo"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=(config.CONNECT_TIMEOUT, 10))
             response.raise_for_status()
-            data = response.json()
+            data = json_codec.loads(response.content)
             
             symbols = []
             for symbol_info in data['symbols']:
@@ -52,9 +58,9 @@ class BinanceClient:
         """
         try:
             url = f"{self.base_url}/ticker/24hr"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=(config.CONNECT_TIMEOUT, 10))
             response.raise_for_status()
-            tickers = response.json()
+            tickers = json_codec.loads(response.content)
             
             # Filter for USDT pairs only
             usdt_tickers = [
@@ -62,13 +68,13 @@ class BinanceClient:
                 if t['symbol'].endswith('USDT')
             ]
             
-            # Sort by volume (quoteVolume = volume in USDT)
-            usdt_tickers.sort(key=lambda x: float(x.get('quoteVolume', 0)), reverse=True)
+            # Top N by volume (quoteVolume = volume in USDT) - partial heap select, no full sort
+            top_tickers = heapq.nlargest(limit, usdt_tickers, key=lambda x: float(x.get('quoteVolume', 0)))
             
             # Extract base symbols
             top_symbols = [
                 t['symbol'].replace('USDT', '') 
-                for t in usdt_tickers[:limit]
+                for t in top_tickers
             ]
             
             return top_symbols
@@ -103,6 +109,7 @@ class BinanceClient:
             
             return top_200[:limit]
     
+    @ttl_cache.ttl_lru_cache(maxsize=512, ttl=config.CACHE_TTL_SECONDS)
     def get_weekly_data(self, symbol: str, weeks: int = 20) -> List[float]:
         """
         Get weekly closing prices for a cryptocurrency
@@ -127,21 +134,19 @@ class BinanceClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 10))
             response.raise_for_status()
-            klines = response.json()
+            klines = json_codec.loads(response.content)
             
-            # Extract close prices
-            # Kline format: [open_time, open, high, low, close, volume, close_time, ...]
-            closes = [float(k[4]) for k in klines]
+            if len(klines) < weeks:
+                raise ValueError(f"Insufficient data: {len(klines)} weeks")
             
+            # Extract close prices of the newest `weeks` klines only
+            # Kline format: [open_time, open, high, low, close, volume, close_time, ...]
+            # Closes arrive as strings - numpy parses them in C without a Python float per row
             # Binance returns oldest first, we want newest first
-            closes.reverse()
-            
-            if len(closes) < weeks:
-                raise ValueError(f"Insufficient data: {len(closes)} weeks")
-            
-            return closes[:weeks]
+            closes = np.fromiter((k[4] for k in klines[-weeks:]), dtype=np.float64, count=weeks)
+            return closes[::-1].tolist()
             
         except Exception as e:
             raise Exception(f"Failed to fetch {symbol}: {str(e)}")
@@ -150,7 +155,7 @@ class BinanceClient:
         """Test Binance API connection"""
         try:
             url = f"{self.base_url}/ping"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=(config.CONNECT_TIMEOUT, 5))
             return response.status_code == 200
         except:
             return False
@@ -1,15 +1,67 @@
 """
 Cache Manager - Persistent storage for asset data and rankings
+
+Prices live in a sqlite KV table with one row per symbol, so a refresh only
+rewrites the series that actually changed. Rankings and metadata go in a
+small state table. A legacy JSON cache file is migrated in on first start.
+
+When Redis is reachable the rankings state is mirrored there too, so every
+worker/replica serves the latest rankings without re-running the update.
 """
-import json
+import functools
 import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import closing
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import chain
+from time import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import json_codec
+import config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+STATE_KEYS = ('big_board', 'crypto_explorer', 'last_update', 'metadata')
+REDIS_STATE_KEY = 'ratio:rankings'  # Redis hash of STATE_KEYS + saved_at
+
+def _synchronized(method):
+    """Run a CacheManager method under the instance's state lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class CacheManager:
-    def __init__(self, cache_file='data_cache.json'):
+    def __init__(self, cache_file='assets.db', export_file='data_cache.json', redis_url: Optional[str] = None):
         self.cache_file = cache_file
-        self.data = {
+        self.export_file = export_file
+        self.redis = self._connect_redis(redis_url)
+        self.data = self._empty_data()
+        self.assets = self.data['assets']  # Shortcut to data['assets'], re-bound whenever it is replaced
+        self._price_matrix = None    # (symbols, prices) view of data['assets'], built on demand
+        self._assets_by_type = None  # {type: {symbol: prices}}, built on demand
+        self._rankings_json = {}     # {'big_board'|'crypto_explorer': (payload, entry ends)}, built on demand
+        self._rankings_deflate = {}  # {'big_board'|'crypto_explorer': raw deflate of the full payload}, built on demand
+        self._asset_index = None     # {symbol: ranking entry}, built on demand
+        self._dirty = set()          # symbols to upsert on next save
+        self._removed = set()        # symbols to delete on next save
+        self._unsaved = False        # rankings changed since the last save
+        self._saved_at = None        # stamp of the save this process last loaded or wrote
+        self._lock = threading.RLock()  # Request threads (refresh) vs the background update thread
+        self._init_db()
+        self.load()
+    
+    @staticmethod
+    def _empty_data() -> dict:
+        return {
             'assets': {},           # {symbol: [weekly_prices]}
             'big_board': [],        # Ranked assets
             'crypto_explorer': [],  # Crypto-only rankings
@@ -21,29 +73,172 @@ class CacheManager:
                 'crypto': 0
             }
         }
-        self.load()
     
+    def _connect(self):
+        # One short-lived connection per operation - safe across the Flask and background threads
+        return closing(sqlite3.connect(self.cache_file, timeout=30))
+    
+    @staticmethod
+    def _connect_redis(redis_url: Optional[str]):
+        """Connect to Redis for the shared rankings state - None if unavailable"""
+        if not redis_url or redis is None:
+            return None
+        try:
+            client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+            client.ping()
+            print("✓ Connected to Redis - rankings are shared across workers")
+            return client
+        except Exception as e:
+            print(f"Redis unavailable ({e}) - using the local database only")
+            return None
+    
+    def _init_db(self):
+        with self._connect() as conn, conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS assets (symbol TEXT PRIMARY KEY, prices BLOB, updated REAL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS rankings (key TEXT PRIMARY KEY, value BLOB)')
+    
+    @_synchronized
     def load(self):
         """Load cache from disk"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    self.data = json.load(f)
-                print(f"✓ Loaded cache from disk: {len(self.data.get('assets', {}))} assets")
-                return True
-            except Exception as e:
-                print(f"✗ Error loading cache: {e}")
-                return False
-        else:
+        try:
+            with self._connect() as conn:
+                asset_rows = conn.execute('SELECT symbol, prices FROM assets').fetchall()
+                state_rows = conn.execute('SELECT key, value FROM rankings').fetchall()
+        except Exception as e:
+            print(f"✗ Error loading cache: {e}")
+            return False
+        
+        # Redis normally holds the newest rankings when several workers/replicas share
+        # it, but a failed Redis write leaves it behind sqlite - take whichever is newer
+        redis_state = self._read_redis_state()
+        state = max(redis_state or {}, dict(state_rows), key=self._stamp)
+        
+        data = self._empty_data()
+        data['assets'] = {s: np.frombuffer(blob, dtype=config.PRICE_DTYPE).tolist() for s, blob in asset_rows}
+        for key in STATE_KEYS:
+            if key in state:
+                data[key] = json_codec.loads(state[key])
+        self.data = data
+        # The stamp refresh() compares against - Redis's whenever Redis is in use
+        self._saved_at = (redis_state or state).get('saved_at')
+        self._unsaved = False
+        self._dirty.clear()
+        self._removed.clear()
+        self._invalidate_views()
+        if not asset_rows and not state:
+            return self._import_json()
+        
+        self._price_matrix = self._matrix_from_blobs(asset_rows)
+        print(f"✓ Loaded cache from disk: {len(data['assets'])} assets")
+        return True
+    
+    @staticmethod
+    def _matrix_from_blobs(asset_rows) -> Tuple[List[str], np.ndarray]:
+        """
+        Build the get_price_matrix() view straight from the stored price blobs
+        The first MA_PERIOD values of each row are joined into one buffer, so no
+        Python floats are created on the way into the ranking matrix
+        """
+        width = config.MA_PERIOD * np.dtype(config.PRICE_DTYPE).itemsize
+        rows = [(s, blob) for s, blob in asset_rows if len(blob) >= width]
+        buffer = b''.join(blob[:width] for _, blob in rows)
+        prices = np.frombuffer(buffer, dtype=config.PRICE_DTYPE).reshape(len(rows), config.MA_PERIOD)
+        return [s for s, _ in rows], prices
+    
+    def _import_json(self):
+        """Migrate a legacy JSON cache into the database"""
+        if not os.path.exists(self.export_file):
             print("No cache file found - starting fresh")
             return False
+        try:
+            with open(self.export_file, 'rb') as f:
+                self.data = {**self._empty_data(), **json_codec.loads(f.read())}
+            self._invalidate_views()
+            self._dirty = set(self.assets)
+            print(f"✓ Imported JSON cache: {len(self.assets)} assets")
+            self.save()
+            return True
+        except Exception as e:
+            print(f"✗ Error loading cache: {e}")
+            return False
+    
+    @staticmethod
+    def _stamp(state: dict) -> float:
+        """saved_at of a stored state as a number (0 when it has none)"""
+        saved_at = state.get('saved_at')
+        return float(saved_at) if saved_at else 0.0
+    
+    def _read_redis_state(self) -> Optional[dict]:
+        if self.redis is None:
+            return None
+        try:
+            return {k.decode(): v for k, v in self.redis.hgetall(REDIS_STATE_KEY).items()}
+        except Exception as e:
+            print(f"✗ Error reading rankings from Redis: {e}")
+            return None
+    
+    def _stored_saved_at(self):
+        """Stamp of the most recent save by any worker"""
+        if self.redis is not None:
+            try:
+                return self.redis.hget(REDIS_STATE_KEY, 'saved_at')
+            except Exception:
+                pass
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM rankings WHERE key = 'saved_at'").fetchone()
+        return row[0] if row else None
     
+    def refresh(self) -> bool:
+        """
+        Reload if another worker has saved since this one last loaded or saved
+        Cheap enough to call per request: one Redis HGET or sqlite lookup
+        """
+        # Never wait on (or interleave with) an update thread's load/set_assets/save
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if self._unsaved or self._dirty or self._removed:
+                return False  # This process is mid-update - its own save comes next
+            try:
+                saved_at = self._stored_saved_at()
+            except Exception:
+                return False
+            if saved_at is None or saved_at == self._saved_at:
+                return False
+            return self.load()
+        finally:
+            self._lock.release()
+    
+    @_synchronized
     def save(self):
-        """Save cache to disk"""
+        """Save changed assets and the rankings state to disk (one transaction)"""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
-            print(f"✓ Saved cache to disk: {len(self.data.get('assets', {}))} assets")
+            assets = self.assets
+            now = time()
+            saved_at = repr(now).encode()
+            state = [(key, json_codec.dumps(self.data.get(key))) for key in STATE_KEYS]
+            state.append(('saved_at', saved_at))
+            rows = [
+                (s, np.asarray(assets[s], dtype=config.PRICE_DTYPE).tobytes(), now)
+                for s in self._dirty if s in assets
+            ]
+            with self._connect() as conn, conn:
+                conn.executemany('DELETE FROM assets WHERE symbol = ?', [(s,) for s in self._removed])
+                conn.executemany('INSERT OR REPLACE INTO assets (symbol, prices, updated) VALUES (?, ?, ?)', rows)
+                conn.executemany('INSERT OR REPLACE INTO rankings (key, value) VALUES (?, ?)', state)
+            if self.redis is not None:
+                try:
+                    self.redis.hset(REDIS_STATE_KEY, mapping=dict(state))
+                except Exception as e:
+                    print(f"✗ Error sharing rankings via Redis: {e}")
+                    # Track whatever Redis still holds, so refresh() doesn't reload this
+                    # worker back onto it; load() prefers the newer sqlite state anyway
+                    saved_at = self._stored_saved_at()
+            self._dirty.clear()
+            self._removed.clear()
+            self._unsaved = False
+            self._saved_at = saved_at
+            print(f"✓ Saved cache to disk: {len(rows)} of {len(assets)} assets written")
             return True
         except Exception as e:
             print(f"✗ Error saving cache: {e}")
@@ -51,54 +246,142 @@ class CacheManager:
     
     def get_assets(self) -> Dict[str, List[float]]:
         """Get all asset price data"""
-        return self.data.get('assets', {})
+        return self.assets
     
     def get_asset(self, symbol: str) -> Optional[List[float]]:
         """Get single asset price data"""
-        return self.data.get('assets', {}).get(symbol)
+        return self.assets.get(symbol)
     
+    @_synchronized
+    def set_assets(self, assets: Dict[str, List[float]]):
+        """Replace all asset price data"""
+        old = self.assets
+        # Unchanged series are the same list objects (callers copy the dict), so only new ones get written
+        changed = {s for s, prices in assets.items() if old.get(s) is not prices}
+        self._dirty |= changed
+        self._removed = (self._removed | (old.keys() - assets.keys())) - changed
+        self.data['assets'] = assets
+        self._invalidate_views()
+    
+    @_synchronized
     def add_asset(self, symbol: str, prices: List[float]):
         """Add or update single asset"""
-        self.data['assets'][symbol] = prices
+        self.assets[symbol] = prices
+        self._dirty.add(symbol)
+        self._removed.discard(symbol)
+        self._invalidate_views()
     
+    @_synchronized
     def remove_asset(self, symbol: str):
         """Remove single asset"""
-        if symbol in self.data['assets']:
-            del self.data['assets'][symbol]
+        if self.assets.pop(symbol, None) is not None:
+            self._dirty.discard(symbol)
+            self._removed.add(symbol)
+            self._invalidate_views()
+    
+    def get_price_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Get all asset prices as one contiguous (num_assets, MA_PERIOD) matrix
+        Row i holds the newest-first weekly closes of symbols[i]
+        Assets with fewer than MA_PERIOD weeks are left out
+        """
+        if self._price_matrix is None:
+            assets = self.assets
+            symbols = [s for s, prices in assets.items() if len(prices) >= config.MA_PERIOD]
+            prices = np.array(
+                [assets[s][:config.MA_PERIOD] for s in symbols],
+                dtype=config.PRICE_DTYPE
+            ).reshape(len(symbols), config.MA_PERIOD)
+            self._price_matrix = (symbols, prices)
+        return self._price_matrix
     
     def get_assets_by_type(self, asset_type: str) -> Dict[str, List[float]]:
         """Get all assets of a specific type (from rankings metadata)"""
-        # This will be populated by the rankings
-        assets = {}
-        for asset in self.data.get('big_board', []) + self.data.get('crypto_explorer', []):
-            if asset.get('type') == asset_type:
+        if self._assets_by_type is None:
+            assets = self.assets
+            by_type = {}
+            for asset in chain(self.data.get('big_board', []), self.data.get('crypto_explorer', [])):
                 symbol = asset['symbol']
-                if symbol in self.data['assets']:
-                    assets[symbol] = self.data['assets'][symbol]
-        return assets
+                if symbol in assets:
+                    by_type.setdefault(asset.get('type'), {})[symbol] = assets[symbol]
+            self._assets_by_type = by_type
+        return self._assets_by_type.get(asset_type, {})
+    
+    def get_ranked_asset(self, symbol: str) -> Optional[dict]:
+        """Get an asset's ranking entry - big board first, then crypto explorer"""
+        if self._asset_index is None:
+            index = {}
+            for asset in chain(self.data.get('big_board', []), self.data.get('crypto_explorer', [])):
+                index.setdefault(asset['symbol'], asset)
+            self._asset_index = index
+        return self._asset_index.get(symbol)
     
+    def get_rankings_json(self, key: str) -> Tuple[bytes, List[int]]:
+        """
+        Get a rankings list ('big_board' or 'crypto_explorer') as its JSON entries
+        joined with commas, plus the end offset of every entry
+        The first N entries are payload[:ends[N - 1]], so any limit is served
+        from a slice - encoded once per rankings update, not on every request
+        """
+        encoded = self._rankings_json.get(key)
+        if encoded is None:
+            entries = [json_codec.dumps(asset) for asset in self.data.get(key) or []]
+            ends, offset = [], -1  # -1 cancels the comma the first entry doesn't have
+            for entry in entries:
+                offset += len(entry) + 1
+                ends.append(offset)
+            encoded = (b','.join(entries), ends)
+            self._rankings_json[key] = encoded
+        return encoded
+    
+    def get_rankings_deflate(self, key: str) -> bytes:
+        """
+        Get the full get_rankings_json payload as raw deflate ending in a sync flush
+        Compressed once per rankings update and spliced into each gzip response
+        """
+        deflated = self._rankings_deflate.get(key)
+        if deflated is None:
+            payload, _ = self.get_rankings_json(key)
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+            deflated = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._rankings_deflate[key] = deflated
+        return deflated
+    
+    def _invalidate_views(self):
+        """Re-bind self.assets and drop derived views so they are rebuilt from self.data on next access"""
+        self.assets = self.data['assets']
+        self._price_matrix = None
+        self._assets_by_type = None
+        self._rankings_json = {}
+        self._rankings_deflate = {}
+        self._asset_index = None
+    
+    @_synchronized
     def update_rankings(self, big_board: List[dict], crypto_explorer: List[dict]):
         """Update rankings and metadata"""
         self.data['big_board'] = big_board
         self.data['crypto_explorer'] = crypto_explorer
         self.data['last_update'] = datetime.now().isoformat()
+        self._assets_by_type = None
+        self._rankings_json = {}
+        self._rankings_deflate = {}
+        self._asset_index = None
+        self._unsaved = True
         
-        # Update metadata
-        all_assets = big_board + crypto_explorer
+        # Update metadata - count every type in a single pass
+        counts = Counter(a.get('type') for a in chain(big_board, crypto_explorer))
         self.data['metadata'] = {
-            'total_assets': len(self.data['assets']),
-            'stocks': len([a for a in all_assets if a.get('type') == 'stock']),
-            'etfs': len([a for a in all_assets if a.get('type') == 'etf']),
-            'crypto': len([a for a in all_assets if a.get('type') == 'crypto'])
+            'total_assets': len(self.assets),
+            'stocks': counts['stock'],
+            'etfs': counts['etf'],
+            'crypto': counts['crypto']
         }
     
+    @_synchronized
     def clear(self):
         """Clear all cache data"""
-        self.data = {
-            'assets': {},
-            'big_board': [],
-            'crypto_explorer': [],
-            'last_update': None,
-            'metadata': {'total_assets': 0, 'stocks': 0, 'etfs': 0, 'crypto': 0}
-        }
+        self._removed |= self.assets.keys()
+        self._dirty.clear()
+        self.data = self._empty_data()
+        self._invalidate_views()
         self.save()
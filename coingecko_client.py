@@ -3,67 +3,76 @@ CoinGecko Public API Client
 Handles cryptocurrency data (free, no API key required)
 Covers ALL major cryptocurrencies
 """
-import requests
+from collections import ChainMap
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import List, Dict
 import time
+import json_codec
+import http_utils
+import ttl_cache
+import config
+
+# Common symbols -> CoinGecko IDs (read-only, shared by every client instance)
+SYMBOL_TO_ID = MappingProxyType({
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'BNB': 'binancecoin',
+    'SOL': 'solana',
+    'XRP': 'ripple',
+    'ADA': 'cardano',
+    'AVAX': 'avalanche-2',
+    'DOGE': 'dogecoin',
+    'DOT': 'polkadot',
+    'MATIC': 'matic-network',
+    'LINK': 'chainlink',
+    'UNI': 'uniswap',
+    'ATOM': 'cosmos',
+    'LTC': 'litecoin',
+    'BCH': 'bitcoin-cash',
+    'NEAR': 'near',
+    'ICP': 'internet-computer',
+    'APT': 'aptos',
+    'FIL': 'filecoin',
+    'ARB': 'arbitrum',
+    'OP': 'optimism',
+    'STX': 'blockstack',
+    'IMX': 'immutable-x',
+    'INJ': 'injective-protocol',
+    'CRO': 'crypto-com-chain',
+    'VET': 'vechain',
+    'HBAR': 'hedera-hashgraph',
+    'MKR': 'maker',
+    'RNDR': 'render-token',
+    'GRT': 'the-graph',
+    'ALGO': 'algorand',
+    'AAVE': 'aave',
+    'ETC': 'ethereum-classic',
+    'XLM': 'stellar',
+    'RUNE': 'thorchain',
+    'SAND': 'the-sandbox',
+    'MANA': 'decentraland',
+    'AXS': 'axie-infinity',
+    'THETA': 'theta-token',
+    'FTM': 'fantom',
+    'EOS': 'eos',
+    'XTZ': 'tezos',
+    'EGLD': 'elrond-erd-2',
+    'TRX': 'tron',
+    'TON': 'the-open-network',
+    'SHIB': 'shiba-inu',
+    'DAI': 'dai',
+    'USDC': 'usd-coin',
+})
 
 class CoinGeckoClient:
     def __init__(self):
         self.base_url = 'https://api.coingecko.com/api/v3'
+        self.session = http_utils.create_session()
         self._coins_cache = None
         
-        # Map common symbols to CoinGecko IDs
-        self.symbol_to_id = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'XRP': 'ripple',
-            'ADA': 'cardano',
-            'AVAX': 'avalanche-2',
-            'DOGE': 'dogecoin',
-            'DOT': 'polkadot',
-            'MATIC': 'matic-network',
-            'LINK': 'chainlink',
-            'UNI': 'uniswap',
-            'ATOM': 'cosmos',
-            'LTC': 'litecoin',
-            'BCH': 'bitcoin-cash',
-            'NEAR': 'near',
-            'ICP': 'internet-computer',
-            'APT': 'aptos',
-            'FIL': 'filecoin',
-            'ARB': 'arbitrum',
-            'OP': 'optimism',
-            'STX': 'blockstack',
-            'IMX': 'immutable-x',
-            'INJ': 'injective-protocol',
-            'CRO': 'crypto-com-chain',
-            'VET': 'vechain',
-            'HBAR': 'hedera-hashgraph',
-            'MKR': 'maker',
-            'RNDR': 'render-token',
-            'GRT': 'the-graph',
-            'ALGO': 'algorand',
-            'AAVE': 'aave',
-            'ETC': 'ethereum-classic',
-            'XLM': 'stellar',
-            'RUNE': 'thorchain',
-            'SAND': 'the-sandbox',
-            'MANA': 'decentraland',
-            'AXS': 'axie-infinity',
-            'THETA': 'theta-token',
-            'FTM': 'fantom',
-            'EOS': 'eos',
-            'XTZ': 'tezos',
-            'EGLD': 'elrond-erd-2',
-            'TRX': 'tron',
-            'TON': 'the-open-network',
-            'SHIB': 'shiba-inu',
-            'DAI': 'dai',
-            'USDC': 'usd-coin',
-        }
+        # Ids learned from the markets endpoint shadow the built-in map without copying it
+        self.symbol_to_id = ChainMap({}, SYMBOL_TO_ID)
     
     def get_top_coins(self, limit: int = 200) -> List[str]:
         """
@@ -80,9 +89,9 @@ class CoinGeckoClient:
                 'sparkline': False
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
             response.raise_for_status()
-            coins = response.json()
+            coins = json_codec.loads(response.content)
             
             # Build symbol to ID mapping from response
             for coin in coins:
@@ -104,6 +113,7 @@ class CoinGeckoClient:
             # Return hardcoded top coins
             return list(self.symbol_to_id.keys())[:limit]
     
+    @ttl_cache.ttl_lru_cache(maxsize=512, ttl=config.CACHE_TTL_SECONDS)
     def get_weekly_data(self, symbol: str, weeks: int = 20) -> List[float]:
         """
         Get weekly closing prices for a cryptocurrency
@@ -131,23 +141,17 @@ class CoinGeckoClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
             response.raise_for_status()
-            data = response.json()
+            data = json_codec.loads(response.content)
             
             # Extract prices (timestamp, price pairs)
             prices = data.get('prices', [])
             if not prices:
                 raise ValueError(f"No price data returned for {symbol}")
             
-            # Convert to weekly by sampling every 7 days
-            weekly_prices = []
-            for i in range(0, len(prices), 7):
-                if prices[i]:
-                    weekly_prices.append(prices[i][1])  # [timestamp, price]
-            
-            # Reverse to get newest first
-            weekly_prices.reverse()
+            # Convert to weekly by sampling every 7 days, reversed to get newest first
+            weekly_prices = [p[1] for p in prices[::7][::-1] if p]  # [timestamp, price]
             
             if len(weekly_prices) < weeks:
                 raise ValueError(f"Insufficient data: {len(weekly_prices)} weeks")
@@ -161,7 +165,7 @@ class CoinGeckoClient:
         """Test CoinGecko API connection"""
         try:
             url = f"{self.base_url}/ping"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=(config.CONNECT_TIMEOUT, 5))
             return response.status_code == 200
         except:
             return False
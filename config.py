@@ -15,8 +15,17 @@ COINCAP_BASE_URL = 'https://api.coincap.io/v2'
 
 # Settings
 MA_PERIOD = 20  # 20-week moving average
+# Stored/ranked price precision. Kept at float64: float32 rounds A0/B0 vs the MA ratio
+# enough to flip near-tie matchups, and the whole matrix is only ~250 KB anyway.
+# Changing it invalidates the price blobs already in assets.db.
+PRICE_DTYPE = 'float64'
 UPDATE_INTERVAL_HOURS = 1  # Hourly updates
+AUTO_UPDATE = os.getenv('AUTO_UPDATE', 'False').lower() == 'true'  # Run updates on UPDATE_INTERVAL_HOURS in-process
 CACHE_TTL_SECONDS = 3600  # 1 hour cache
+CRYPTOCOMPARE_CALLS_PER_MINUTE = 40  # Free tier allows ~50/min - keep some headroom
+FETCH_CONCURRENCY = 16  # Parallel per-symbol Massive requests
+CONNECT_TIMEOUT = 3  # Seconds to establish a connection - read timeouts are set per call
+UPDATE_DEADLINE_SECONDS = 1800  # Fetches still pending this long into an update are abandoned
 
 # Asset Lists
 SP500_LIMIT = 500
@@ -35,3 +44,4 @@ REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
 # Server
 PORT = int(os.getenv('PORT', 5000))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+ENABLE_DIAGNOSTICS = os.getenv('ENABLE_DIAGNOSTICS', 'False').lower() == 'true'  # Serve /api/network-test (live upstream probes)
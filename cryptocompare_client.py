@@ -3,10 +3,14 @@ CryptoCompare API Client
 Handles cryptocurrencies not available on Coinbase
 Free tier: 100,000 calls/month, ~50 calls/minute
 """
-import requests
 from datetime import datetime, timedelta
-from typing import List, Dict
-import time
+from typing import List, Dict, Iterator, Tuple, Optional
+import logging
+import json_codec
+import http_utils
+import reliability
+import ttl_cache
+import config
 
 # Coins CryptoCompare doesn't carry or has bad data for - use CoinGecko as fallback
 # Format: {symbol: coingecko_id}
@@ -24,6 +28,16 @@ COINGECKO_FALLBACK = {
 
 COINGECKO_BASE = 'https://api.coingecko.com/api/v3'
 
+# Current prices for many coins in one call (fsyms is capped at 300 characters)
+PRICEMULTI_URL = 'https://min-api.cryptocompare.com/data/pricemulti'
+PRICEMULTI_BATCH = 50
+
+logger = logging.getLogger(__name__)
+
+# CoinGecko free tier: one fallback call every 25 seconds to be safe, shared by all fetch threads
+_coingecko_limiter = http_utils.RateLimiter(rate=1 / 25)
+_coingecko_session = http_utils.create_session(pool_size=1)  # Calls are spaced out by the limiter
+
 
 def fetch_from_coingecko(coingecko_id: str, weeks: int = 20) -> List[float]:
     """
@@ -38,17 +52,16 @@ def fetch_from_coingecko(coingecko_id: str, weeks: int = 20) -> List[float]:
         'days': days,
         'interval': 'daily'
     }
-    response = requests.get(url, params=params, timeout=15)
+    response = _coingecko_session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
     response.raise_for_status()
-    data = response.json()
+    data = json_codec.loads(response.content)
 
     prices = data.get('prices', [])
     if not prices:
         raise ValueError(f"No price data from CoinGecko for {coingecko_id}")
 
-    # Sample every 7th day to get weekly closes
-    weekly = [prices[i][1] for i in range(0, len(prices), 7)]
-    weekly.reverse()  # newest first
+    # Sample every 7th day to get weekly closes, newest first
+    weekly = [p[1] for p in prices[::7][::-1]]
 
     if len(weekly) < weeks:
         raise ValueError(f"Only {len(weekly)} weeks of data from CoinGecko")
@@ -58,7 +71,10 @@ def fetch_from_coingecko(coingecko_id: str, weeks: int = 20) -> List[float]:
 class CryptoCompareClient:
     def __init__(self):
         self.base_url = 'https://min-api.cryptocompare.com/data/v2'
+        self.session = http_utils.create_session()
         # Free tier: 100,000 calls/month, ~50 calls/minute - MUCH better than CoinGecko!
+        self.rate_limiter = http_utils.RateLimiter(rate=config.CRYPTOCOMPARE_CALLS_PER_MINUTE / 60)
+        self.breaker = reliability.get_breaker('cryptocompare')
         
     def get_top_coins(self, limit: int = 200) -> List[str]:
         """
@@ -89,13 +105,14 @@ class CryptoCompareClient:
         # Don't truncate must_include coins even if over limit
         # Must-include coins use CoinGecko fallback, so they're critical
         
-        print(f"    Hardcoded list: {len(all_coins)} coins (top 100 + must-include)")
+        logger.debug("    Hardcoded list: %d coins (top 100 + must-include)", len(all_coins))
         return all_coins
     
     def get_symbols(self) -> List[str]:
         """Get list of available symbols - deprecated, use get_top_coins instead"""
         return self.get_top_coins(100)
     
+    @ttl_cache.ttl_lru_cache(maxsize=512, ttl=config.CACHE_TTL_SECONDS)
     def get_weekly_data(self, symbol: str, weeks: int = 20) -> List[float]:
         """
         Get weekly closing prices for a crypto.
@@ -104,13 +121,14 @@ class CryptoCompareClient:
         # Check if we should go straight to CoinGecko for this coin
         if symbol in COINGECKO_FALLBACK:
             try:
-                print(f"  → {symbol}: Using CoinGecko fallback...")
-                time.sleep(25)  # CoinGecko free tier: wait 25 seconds between calls to be safe
-                prices = fetch_from_coingecko(COINGECKO_FALLBACK[symbol], weeks)
-                print(f"  ✓ {symbol}: Loaded {len(prices)} weeks from CoinGecko")
+                logger.debug("%s: using CoinGecko fallback", symbol)
+                with reliability.get_breaker('coingecko'):
+                    _coingecko_limiter.acquire()
+                    prices = fetch_from_coingecko(COINGECKO_FALLBACK[symbol], weeks)
+                logger.debug("%s: loaded %d weeks from CoinGecko", symbol, len(prices))
                 return prices
             except Exception as e:
-                print(f"  ✗ {symbol}: CoinGecko also failed - {str(e)}")
+                logger.warning("%s: CoinGecko also failed - %s", symbol, e)
                 raise
 
         # CryptoCompare uses daily data, we'll convert to weekly
@@ -125,9 +143,11 @@ class CryptoCompareClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            with self.breaker:
+                self.rate_limiter.acquire()
+                response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
+                response.raise_for_status()
+            data = json_codec.loads(response.content)
             
             if data.get('Response') == 'Error':
                 raise ValueError(f"API Error: {data.get('Message', 'Unknown error')}")
@@ -139,27 +159,62 @@ class CryptoCompareClient:
             daily_data = data['Data']['Data']
             daily_closes = [day['close'] for day in daily_data if day['close'] > 0]
             
-            # Convert daily to weekly (take every 7th day)
-            weekly_prices = []
-            for i in range(0, len(daily_closes), 7):
-                if i < len(daily_closes):
-                    weekly_prices.append(daily_closes[i])
-            
-            # Reverse to get most recent first
-            weekly_prices.reverse()
+            # Convert daily to weekly (take every 7th day), most recent first
+            weekly_prices = daily_closes[::7][::-1]
             
             # Return first N weeks
             return weekly_prices[:weeks]
             
         except Exception as e:
-            print(f"    ✗ {symbol}: ERROR - {str(e)}")
+            logger.warning("%s: CryptoCompare error - %s", symbol, e)
             raise
     
+    def get_listed_symbols(self, symbols: List[str]) -> List[str]:
+        """
+        Drop symbols CryptoCompare has no USD price for, using one pricemulti
+        call per batch instead of a failing histoday call per symbol.
+        CoinGecko-fallback coins are always kept. If the check itself fails,
+        every symbol is kept.
+        """
+        listed = set()
+        try:
+            for i in range(0, len(symbols), PRICEMULTI_BATCH):
+                params = {'fsyms': ','.join(symbols[i:i + PRICEMULTI_BATCH]), 'tsyms': 'USD'}
+                self.rate_limiter.acquire()
+                response = self.session.get(PRICEMULTI_URL, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
+                response.raise_for_status()
+                data = json_codec.loads(response.content)
+                if data.get('Response') == 'Error':
+                    raise ValueError(data.get('Message', 'Unknown error'))
+                listed.update(data)
+        except Exception as e:
+            logger.warning("pricemulti check failed, fetching all symbols - %s", e)
+            return list(symbols)
+        
+        return [s for s in symbols if s in listed or s in COINGECKO_FALLBACK]
+    
+    def get_weekly_data_bulk(self, symbols: List[str], weeks: int = 20, max_workers: int = 4,
+                             errors: Optional[List[str]] = None, deadline: Optional[float] = None) -> Dict[str, List[float]]:
+        """
+        Get weekly closing prices for many cryptocurrencies in parallel
+        Returns dict of {symbol: prices} - symbols that fail are left out
+        """
+        return http_utils.fetch_many(self.get_weekly_data, self.get_listed_symbols(symbols), weeks, max_workers, errors, deadline)
+    
+    def iter_weekly_data(self, symbols: List[str], weeks: int = 20, max_workers: int = 4,
+                         errors: Optional[List[str]] = None, deadline: Optional[float] = None) -> Iterator[Tuple[str, List[float]]]:
+        """
+        Like get_weekly_data_bulk, but yields (symbol, prices) as each fetch completes
+        """
+        return http_utils.iter_many(self.get_weekly_data, self.get_listed_symbols(symbols), weeks, max_workers, errors, deadline)
+    
     def test_connection(self) -> bool:
-        """Test API connection"""
+        """Test API connection (one daily candle - no history to download or parse)"""
         try:
-            data = self.get_weekly_data('BNB', weeks=5)
-            return len(data) >= 5
+            url = f"{self.base_url}/histoday"
+            params = {'fsym': 'BTC', 'tsym': 'USD', 'limit': 1}
+            response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 5))
+            return response.ok and json_codec.loads(response.content).get('Response') != 'Error'
         except:
             return False
 
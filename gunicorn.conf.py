@@ -0,0 +1,18 @@
+"""
+Gunicorn settings - picked up automatically from the working directory
+
+Threaded workers: requests spend their time waiting on Redis/sqlite or
+serving pre-encoded bytes, and the update runs on its own background
+thread, so a few threads per worker keep reads flowing during an update.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = 'gthread'
+# Update progress lives in the worker that started it, so default to one worker;
+# rankings themselves are shared between workers through assets.db / Redis
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+keepalive = 5
+timeout = 1800  # Full updates run 30-45 minutes
+graceful_timeout = 1800
@@ -0,0 +1,110 @@
+"""
+HTTP Utilities
+Shared helpers for the API clients
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+def create_session(pool_size: int = 32) -> requests.Session:
+    """
+    Create a requests Session with keep-alive connection pooling
+    
+    Reusing one session per client avoids a new TCP+TLS handshake on every call.
+    Connection errors and transient 429/5xx responses are retried up to 3 times
+    with jittered exponential backoff (so parallel workers don't retry in lockstep)
+    before being returned; other 4xx responses are never retried. A 429/503 that
+    carries Retry-After waits exactly as long as the server asks instead.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        backoff_jitter=0.3,
+        backoff_max=5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=['GET'],
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the last response back so raise_for_status() still applies
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by all of a client's fetch threads
+    
+    acquire() blocks until a token is free. Tokens refill at `rate` per second
+    up to `burst`, so parallel workers stay under the provider's limit while
+    their request latencies still overlap (unlike a fixed sleep per call).
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Take the token now (possibly going negative) and sleep off the debt outside the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+def iter_many(fetch: Callable, symbols: List[str], weeks: int = 20, max_workers: int = 16,
+              errors: Optional[List[str]] = None, deadline: Optional[float] = None) -> Iterator[Tuple[str, List[float]]]:
+    """
+    Call fetch(symbol, weeks) for every symbol on a thread pool, yielding
+    (symbol, weekly_prices) as each one finishes
+    
+    The work is network-bound, so threads overlap the request latency, and
+    callers can start processing the first results while slower symbols are
+    still in flight. A failing symbol is skipped and does not affect the rest;
+    if an errors list is passed, "SYMBOL: reason" is appended to it.
+    Symbols still pending at `deadline` (a time.monotonic() value) are abandoned.
+    """
+    if not symbols:
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(symbols)))
+    futures = {executor.submit(fetch, symbol, weeks): symbol for symbol in symbols}
+    timeout = None if deadline is None else max(0, deadline - time.monotonic())
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            try:
+                prices = future.result()
+            except Exception as e:
+                if errors is not None:
+                    errors.append(f"{futures[future]}: {e}")
+                continue
+            yield futures[future], prices
+    except FuturesTimeoutError:
+        if errors is not None:
+            errors.extend(f"{symbol}: update deadline passed" for future, symbol in futures.items() if not future.done())
+    finally:
+        # Queued fetches are dropped; in-flight ones finish on their own (bounded by the request timeouts)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_many(fetch: Callable, symbols: List[str], weeks: int = 20, max_workers: int = 16,
+               errors: Optional[List[str]] = None, deadline: Optional[float] = None) -> Dict[str, List[float]]:
+    """
+    Fetch every symbol in parallel (see iter_many) and collect the results
+    
+    Returns:
+        Dict of {symbol: weekly_prices} for the symbols that loaded
+    """
+    return dict(iter_many(fetch, symbols, weeks, max_workers, errors, deadline))
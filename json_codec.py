@@ -0,0 +1,29 @@
+"""
+JSON Codec
+Fast JSON encode/decode - uses orjson when installed, stdlib json otherwise
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Decode JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent: bool = False, default=None) -> bytes:
+    """
+    Encode object to JSON bytes - compact unless indent is requested
+    numpy arrays/scalars are encoded natively by orjson; `default` handles other unknown types.
+    Non-string dict keys are stringified, as stdlib json does
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=default).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), default=default).encode('utf-8')
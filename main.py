@@ -2,17 +2,26 @@
 Ratio - Asset Strength Rankings API
 Main Flask application
 """
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
-import json
-
 import threading
 import time
-import json
+import atexit
+import hashlib
+import logging
+import logging.handlers
+import queue
+import uuid
+import struct
+import zlib
 
 import config
+import json_codec
+import reliability
+import ttl_cache
 from massive_client import MassiveClient
 from cryptocompare_client import CryptoCompareClient
 from stooq_client import StooqClient
@@ -20,7 +29,29 @@ from cache_manager import CacheManager
 from name_lookup import NameLookup
 from tournament import calculate_tournament_rankings, format_rankings_summary
 
+# INFO by default - per-symbol client chatter is logged at DEBUG.
+# Records are queued and written by a listener thread, so fetch threads never wait on stderr
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by json_codec (orjson when installed) - used by jsonify()"""
+    def dumps(self, obj, **kwargs) -> str:
+        return json_codec.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_codec.dumps(obj, default=self.default), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Initialize API clients
@@ -29,9 +60,8 @@ cryptocompare = CryptoCompareClient()
 stooq = StooqClient()
 
 # Initialize persistent cache and name lookup
-cache_manager = CacheManager()
+cache_manager = CacheManager(redis_url=config.REDIS_URL)
 name_lookup = NameLookup()
-cache = cache_manager.data  # For backwards compatibility
 
 # Background update status tracking
 update_status = {
@@ -39,30 +69,86 @@ update_status = {
     'started_at': None,
     'progress': 0,
     'total': 0,
+    'job_id': None,
     'current_task': None,
     'completed_at': None,
     'error': None
 }
 update_lock = threading.Lock()
 
+# Forex pairs are any symbol that looks like XXXYYY (6 letters, currency codes)
+FOREX_CURRENCIES = ('USD', 'EUR', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF')
+
+# Symbol -> type lookups, built once from the static symbol lists (see refresh_symbol_index)
+_symbol_type_index = {}
+_sp500_symbols = frozenset()
+
+def refresh_symbol_index():
+    """Rebuild the symbol -> asset type map (forex beats etf beats stock, anything else is a stock)"""
+    global _symbol_type_index, _sp500_symbols
+    index = dict.fromkeys(massive.get_sp_1500_symbols(), 'stock')
+    index.update(dict.fromkeys(massive.get_major_etfs(), 'etf'))
+    index.update((base + quote, 'forex') for base in FOREX_CURRENCIES for quote in FOREX_CURRENCIES)
+    _symbol_type_index = index
+    _sp500_symbols = frozenset(massive.get_sp500_symbols())
+
+refresh_symbol_index()
+
+def tag_rankings(all_rankings: list) -> list:
+    """
+    Add type, S&P 500 flag and name to each ranking entry (CRYPTO: prefixes are stripped)
+    Returns the crypto entries, in rank order
+    """
+    crypto_rankings = []
+    for asset in all_rankings:
+        symbol = asset['symbol']
+        
+        # Check crypto by prefix first - reliable, no symbol collisions with stocks
+        if symbol.startswith('CRYPTO:'):
+            asset['type'] = 'crypto'
+            asset['symbol'] = symbol[7:]  # Strip CRYPTO: prefix for display
+            asset['sp500'] = False
+            crypto_rankings.append(asset)
+        else:
+            asset['type'] = _symbol_type_index.get(symbol, 'stock')
+            asset['sp500'] = symbol in _sp500_symbols
+    
+    # Look up uncached names in parallel, per type, so the loop below only reads the cache
+    symbols_by_type = {}
+    for asset in all_rankings:
+        if asset['type'] != 'crypto':
+            symbols_by_type.setdefault(asset['type'], []).append(asset['symbol'])
+    for asset_type, symbols in symbols_by_type.items():
+        name_lookup.bulk_fetch(symbols, config.MASSIVE_API_KEY, asset_type)
+    
+    for asset in all_rankings:
+        asset['name'] = name_lookup.get_name(asset['symbol'], asset['type'], config.MASSIVE_API_KEY)
+    name_lookup.save()
+    return crypto_rankings
+
+@app.before_request
+def sync_cache():
+    """Pick up rankings saved by another worker since this one last loaded"""
+    cache_manager.refresh()
+
 def fetch_single_asset(symbol: str) -> list:
     """
     Fetch data for a single asset
     Returns: List of weekly prices or None if failed
     """
-    print(f"    Fetching {symbol}...")
+    logger.debug("    Fetching %s...", symbol)
     
     # Try CryptoCompare for crypto
     try:
         return cryptocompare.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-    except:
-        pass
+    except Exception as e:
+        logger.debug("    %s not on CryptoCompare (%s) - trying Massive", symbol, e)
     
     # Try Massive (stocks/ETFs)
     try:
         return massive.get_weekly_data(symbol, weeks=config.MA_PERIOD)
     except Exception as e:
-        print(f"    ✗ {symbol}: {e}")
+        logger.warning("    ✗ %s: %s", symbol, e)
         return None
 
 def fetch_assets_by_type(asset_type: str, test_mode=False) -> dict:
@@ -85,13 +171,9 @@ def fetch_assets_by_type(asset_type: str, test_mode=False) -> dict:
             symbols = symbols[:50]
         print(f"Fetching {len(symbols)} stocks...")
         
-        for symbol in symbols:
-            try:
-                prices = massive.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-                if len(prices) >= config.MA_PERIOD:
-                    all_data[symbol] = prices
-            except:
-                pass
+        for symbol, prices in massive.iter_weekly_data(symbols, weeks=config.MA_PERIOD, max_workers=config.FETCH_CONCURRENCY):
+            if len(prices) >= config.MA_PERIOD:
+                all_data[symbol] = prices
     
     elif asset_type == 'etfs':
         symbols = massive.get_major_etfs()
@@ -99,13 +181,9 @@ def fetch_assets_by_type(asset_type: str, test_mode=False) -> dict:
             symbols = symbols[:10]
         print(f"Fetching {len(symbols)} ETFs...")
         
-        for symbol in symbols:
-            try:
-                prices = massive.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-                if len(prices) >= config.MA_PERIOD:
-                    all_data[symbol] = prices
-            except:
-                pass
+        for symbol, prices in massive.iter_weekly_data(symbols, weeks=config.MA_PERIOD, max_workers=config.FETCH_CONCURRENCY):
+            if len(prices) >= config.MA_PERIOD:
+                all_data[symbol] = prices
     
     elif asset_type == 'crypto':
         # Fetch top 100 crypto from CryptoCompare (their API max is 100)
@@ -123,52 +201,24 @@ def fetch_assets_by_type(asset_type: str, test_mode=False) -> dict:
             print(f"TEST MODE: Limiting to {len(symbols)} crypto")
         
         crypto_loaded = 0
-        for i, symbol in enumerate(symbols):
-            try:
-                # Rate limiting - CryptoCompare allows ~50 calls/min, wait 1.5 sec each
-                if i > 0:
-                    time.sleep(1.5)
-                
-                prices = cryptocompare.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-                if len(prices) >= config.MA_PERIOD:
-                    all_data[f"CRYPTO:{symbol}"] = prices
-                    crypto_loaded += 1
-                    
-                    if crypto_loaded == 1:
-                        print(f"  ✓ {symbol}: First crypto loaded!")
-                
-                # Progress update every 10
-                if (i + 1) % 10 == 0:
-                    print(f"  Processed {i + 1}/{len(symbols)} crypto ({crypto_loaded} loaded)...")
-            except Exception as e:
-                print(f"  ✗ {symbol}: {str(e)}")
-                pass
+        # Parallel - the client's token bucket keeps us under CryptoCompare's rate limit
+        for i, (symbol, prices) in enumerate(cryptocompare.iter_weekly_data(symbols, weeks=config.MA_PERIOD)):
+            if len(prices) >= config.MA_PERIOD:
+                all_data[f"CRYPTO:{symbol}"] = prices
+                crypto_loaded += 1
+            
+            # Progress update every 10
+            if (i + 1) % 10 == 0:
+                print(f"  Processed {i + 1}/{len(symbols)} crypto ({crypto_loaded} loaded)...")
         
         print(f"✓ Loaded {crypto_loaded}/{len(symbols)} cryptocurrencies")
     
     return all_data
 
-def fetch_all_assets(test_mode=False, skip_crypto=False):
-    """
-    Fetch data for all assets
-    
-    Args:
-        test_mode: If True, use limited asset set for fast iteration
-        skip_crypto: If True, skip crypto loading (for fast daily updates)
-        
-    Returns: Dict of {symbol: [weekly_closes]}
-    """
-    print("\n" + "="*60)
-    print(f"FETCHING ALL ASSET DATA - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    if skip_crypto:
-        print("⚡ SKIP_CRYPTO MODE: Crypto will not be updated")
-    print("="*60)
-    
-    all_data = {}
-    errors = []
-    
-    # 1. Fetch stocks
+def _fetch_stocks(test_mode, errors, deadline) -> dict:
+    """Stock half of fetch_all_assets - Returns: Dict of {symbol: [weekly_closes]}"""
     print("\n📊 Fetching stocks...")
+    stock_data = {}
     
     # Option: Use S&P 1500 (comprehensive) or just S&P 500
     use_sp1500 = config.USE_SP1500 if hasattr(config, 'USE_SP1500') else True
@@ -182,7 +232,7 @@ def fetch_all_assets(test_mode=False, skip_crypto=False):
     
     # Extra stocks not in S&P 1500
     extra_stocks = ['PURR', 'BHYP']
-    stock_symbols = stock_symbols + [s for s in extra_stocks if s not in stock_symbols]
+    stock_symbols = stock_symbols + tuple(s for s in extra_stocks if s not in stock_symbols)
     
     if test_mode:
         stock_symbols = stock_symbols[:50]  # Only 50 stocks in test mode
@@ -190,28 +240,24 @@ def fetch_all_assets(test_mode=False, skip_crypto=False):
     else:
         print(f"Found {len(stock_symbols)} stock symbols")
     
-    for i, symbol in enumerate(stock_symbols):
-        try:
-            prices = massive.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-            print(f"  {symbol}: Got {len(prices)} weeks of data")
-            if len(prices) >= config.MA_PERIOD:
-                all_data[symbol] = prices
-                print(f"  ✓ {symbol} added to dataset")
-            else:
-                errors.append(f"{symbol}: insufficient data ({len(prices)} weeks)")
-                print(f"  ✗ {symbol}: only {len(prices)} weeks")
-            
-            if (i + 1) % 10 == 0:
-                print(f"  Progress: {i + 1}/{len(stock_symbols)} stocks...")
-                time.sleep(0.5)  # Reduced from 1 second
-        except Exception as e:
-            errors.append(f"{symbol}: {str(e)}")
-            print(f"  ✗ {symbol}: ERROR - {str(e)}")
-    
-    print(f"✓ Loaded {len([s for s in stock_symbols if s in all_data])} stocks")
+    # Fetch in parallel - results are handled here as they arrive
+    for i, (symbol, prices) in enumerate(massive.iter_weekly_data(stock_symbols, weeks=config.MA_PERIOD, max_workers=config.FETCH_CONCURRENCY, errors=errors, deadline=deadline)):
+        logger.debug("  %s: Got %d weeks of data", symbol, len(prices))
+        if len(prices) >= config.MA_PERIOD:
+            stock_data[symbol] = prices
+        else:
+            errors.append(f"{symbol}: insufficient data ({len(prices)} weeks)")
+        
+        if (i + 1) % 100 == 0:
+            print(f"  Progress: {i + 1}/{len(stock_symbols)} stocks...")
     
-    # 2. Fetch ETFs
+    print(f"✓ Loaded {len(stock_data)} stocks")
+    return stock_data
+
+def _fetch_etfs(test_mode, errors, deadline) -> dict:
+    """ETF half of fetch_all_assets - Returns: Dict of {symbol: [weekly_closes]}"""
     print("\n📈 Fetching ETFs...")
+    etf_data = {}
     etf_symbols = massive.get_major_etfs()
     
     if test_mode:
@@ -220,80 +266,94 @@ def fetch_all_assets(test_mode=False, skip_crypto=False):
     else:
         print(f"Found {len(etf_symbols)} ETF symbols")
     
-    for i, symbol in enumerate(etf_symbols):
-        try:
-            prices = massive.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-            if len(prices) >= config.MA_PERIOD:
-                all_data[symbol] = prices
-            else:
-                errors.append(f"{symbol}: insufficient data")
-            
-            if (i + 1) % 10 == 0:
-                print(f"  Processed {i + 1}/{len(etf_symbols)} ETFs...")
-                time.sleep(1)
-        except Exception as e:
-            errors.append(f"{symbol}: {str(e)}")
+    for i, (symbol, prices) in enumerate(massive.iter_weekly_data(etf_symbols, weeks=config.MA_PERIOD, max_workers=config.FETCH_CONCURRENCY, errors=errors, deadline=deadline)):
+        if len(prices) >= config.MA_PERIOD:
+            etf_data[symbol] = prices
+        else:
+            errors.append(f"{symbol}: insufficient data")
+        
+        if (i + 1) % 10 == 0:
+            print(f"  Processed {i + 1}/{len(etf_symbols)} ETFs...")
     
-    print(f"✓ Loaded {len([s for s in etf_symbols if s in all_data])} ETFs")
+    print(f"✓ Loaded {len(etf_data)} ETFs")
+    return etf_data
+
+def _fetch_crypto(test_mode, errors, deadline) -> dict:
+    """Crypto half of fetch_all_assets - Returns: Dict of {CRYPTO:symbol: [weekly_closes]}"""
+    print("\n🪙 Fetching cryptocurrency data from CryptoCompare...")
+    crypto_data = {}
     
-    # 3. Fetch crypto from CryptoCompare (Top 100 by market cap)
-    if skip_crypto:
-        print("\n🪙 Cryptocurrency data - SKIPPED (skip_crypto=True)")
-        print("  Crypto assets will retain their previous cached values")
+    # Get top cryptocurrencies by market cap (CryptoCompare max is 100)
+    crypto_limit = min(config.CRYPTO_LIMIT if hasattr(config, 'CRYPTO_LIMIT') else 100, 100)
+    
+    try:
+        cryptocompare_symbols = cryptocompare.get_top_coins(limit=crypto_limit)
+        print(f"  Got {len(cryptocompare_symbols)} crypto symbols from CryptoCompare")
+    except Exception as e:
+        print(f"  ✗ ERROR getting symbols: {e}")
+        cryptocompare_symbols = []
+    
+    if test_mode:
+        cryptocompare_symbols = cryptocompare_symbols[:5]  # Just 5 in test mode
+        print(f"⚡ TEST MODE: Limiting to {len(cryptocompare_symbols)} crypto")
     else:
-        print("\n🪙 Fetching cryptocurrency data from CryptoCompare...")
-        
-        # Get top cryptocurrencies by market cap (CryptoCompare max is 100)
-        crypto_limit = min(config.CRYPTO_LIMIT if hasattr(config, 'CRYPTO_LIMIT') else 100, 100)
-        
-        try:
-            cryptocompare_symbols = cryptocompare.get_top_coins(limit=crypto_limit)
-            print(f"  Got {len(cryptocompare_symbols)} crypto symbols from CryptoCompare")
-        except Exception as e:
-            print(f"  ✗ ERROR getting symbols: {e}")
-            cryptocompare_symbols = []
-        
-        if test_mode:
-            cryptocompare_symbols = cryptocompare_symbols[:5]  # Just 5 in test mode
-            print(f"⚡ TEST MODE: Limiting to {len(cryptocompare_symbols)} crypto")
+        if len(cryptocompare_symbols) > 0:
+            print(f"Loading top {len(cryptocompare_symbols)} cryptocurrencies by market cap...")
         else:
-            if len(cryptocompare_symbols) > 0:
-                print(f"Loading top {len(cryptocompare_symbols)} cryptocurrencies by market cap...")
-            else:
-                print(f"  ✗ No crypto symbols available - skipping crypto")
+            print(f"  ✗ No crypto symbols available - skipping crypto")
+    
+    # Fetch in parallel - the client's token bucket keeps us under CryptoCompare's rate limit
+    for i, (symbol, prices) in enumerate(cryptocompare.iter_weekly_data(cryptocompare_symbols, weeks=config.MA_PERIOD, errors=errors, deadline=deadline)):
+        if len(prices) >= config.MA_PERIOD:
+            crypto_data[f"CRYPTO:{symbol}"] = prices
+        else:
+            errors.append(f"{symbol}: insufficient data ({len(prices)} weeks)")
         
-        crypto_loaded = 0
-        crypto_failed = 0
+        # Progress update every 10
+        if (i + 1) % 10 == 0:
+            print(f"  Processed {i + 1}/{len(cryptocompare_symbols)} crypto ({len(crypto_data)} loaded)...")
+    
+    crypto_failed = len(cryptocompare_symbols) - len(crypto_data)
+    print(f"✓ Crypto loading complete: {len(crypto_data)} loaded, {crypto_failed} failed out of {len(cryptocompare_symbols)} total")
+    return crypto_data
+
+def fetch_all_assets(test_mode=False, skip_crypto=False):
+    """
+    Fetch data for all assets
+    
+    Crypto (CryptoCompare) loads on its own thread while stocks and then
+    ETFs (both Massive) load on this one, so the update takes about as long
+    as the slower provider rather than the sum of both
+    
+    Args:
+        test_mode: If True, use limited asset set for fast iteration
+        skip_crypto: If True, skip crypto loading (for fast daily updates)
         
-        for i, symbol in enumerate(cryptocompare_symbols):
-            try:
-                # Rate limiting - CryptoCompare allows ~50 calls/min, wait 1.5 sec each
-                if i > 0:
-                    time.sleep(1.5)
-                
-                prices = cryptocompare.get_weekly_data(symbol, weeks=config.MA_PERIOD)
-                if len(prices) >= config.MA_PERIOD:
-                    all_data[f"CRYPTO:{symbol}"] = prices
-                    crypto_loaded += 1
-                    
-                    # Print first successful load
-                    if crypto_loaded == 1:
-                        print(f"  ✓ {symbol}: Successfully loaded {len(prices)} weeks (first crypto loaded!)")
-                else:
-                    errors.append(f"{symbol}: insufficient data ({len(prices)} weeks)")
-                    crypto_failed += 1
-                
-                # Progress update every 10
-                if (i + 1) % 10 == 0:
-                    print(f"  Processed {i + 1}/{len(cryptocompare_symbols)} crypto ({crypto_loaded} loaded, {crypto_failed} failed)...")
-                
-            except Exception as e:
-                # Print all errors so we can see what's failing
-                print(f"  ✗ {symbol}: {str(e)}")
-                errors.append(f"{symbol}: {str(e)}")
-                crypto_failed += 1
+    Returns: Dict of {symbol: [weekly_closes]}
+    """
+    print("\n" + "="*60)
+    print(f"FETCHING ALL ASSET DATA - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if skip_crypto:
+        print("⚡ SKIP_CRYPTO MODE: Crypto will not be updated")
+    print("="*60)
+    
+    all_data = {}
+    errors = []
+    # Fetches still pending past this point are abandoned rather than holding up the whole update
+    deadline = time.monotonic() + config.UPDATE_DEADLINE_SECONDS
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        crypto_future = None if skip_crypto else executor.submit(_fetch_crypto, test_mode, errors, deadline)
         
-        print(f"✓ Crypto loading complete: {crypto_loaded} loaded, {crypto_failed} failed out of {len(cryptocompare_symbols)} total")
+        # Stocks and ETFs share Massive's grouped-daily snapshots, so they run one after the other
+        all_data.update(_fetch_stocks(test_mode, errors, deadline))
+        all_data.update(_fetch_etfs(test_mode, errors, deadline))
+        
+        if crypto_future is None:
+            print("\n🪙 Cryptocurrency data - SKIPPED (skip_crypto=True)")
+            print("  Crypto assets will retain their previous cached values")
+        else:
+            all_data.update(crypto_future.result())
     
     print("\n" + "="*60)
     print(f"TOTAL ASSETS LOADED: {len(all_data)}")
@@ -335,10 +395,8 @@ def update_rankings(test_mode=False, asset_type=None, symbol=None, skip_crypto=F
             
             # For crypto updates: remove existing crypto to avoid duplicates
             if asset_type == 'crypto':
-                # Get list of crypto we're about to load
-                from cryptocompare_client import CryptoCompareClient
-                cc = CryptoCompareClient()
-                crypto_symbols = cc.get_top_coins(limit=200)
+                # Get set of crypto we're about to load (set - checked once per cached key below)
+                crypto_symbols = set(cryptocompare.get_top_coins(limit=200))
                 
                 # Remove both CRYPTO: prefixed entries and plain symbols that match crypto
                 keys_to_remove = [k for k in existing_data.keys() 
@@ -366,61 +424,18 @@ def update_rankings(test_mode=False, asset_type=None, symbol=None, skip_crypto=F
                     if symbol not in assets_data:
                         assets_data[symbol] = data
         
-        # Save asset data to persistent cache
-        cache_manager.data['assets'] = assets_data
-        
         if len(assets_data) < 10:
             raise ValueError("Not enough assets loaded")
         
+        # Save asset data to persistent cache
+        cache_manager.set_assets(assets_data)
+        
         # Calculate tournament rankings
         print("\n🏆 Calculating tournament rankings...")
-        all_rankings = calculate_tournament_rankings(assets_data)
-        
-        # Get symbols lists for categorization
-        sp500_symbols_set = set(massive.get_sp500_symbols())
-        sp1500_symbols = set(massive.get_sp_1500_symbols())
-        etf_symbols = set(massive.get_major_etfs())
-        
-        # Forex pairs are any symbol that looks like XXXYYY (6 letters, currency codes)
-        forex_currencies = {'USD', 'EUR', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF'}
-        
-        # Crypto symbols - any symbol in all_data that's not stock/etf/forex
-        # We'll detect crypto by elimination after checking other types
+        all_rankings = calculate_tournament_rankings(assets_data, cache_manager.get_price_matrix())
         
         # Add asset type, S&P 500 flag, and name to each ranking
-        for asset in all_rankings:
-            symbol = asset['symbol']
-            
-            # Check crypto by prefix first - reliable, no symbol collisions with stocks
-            if symbol.startswith('CRYPTO:'):
-                asset['type'] = 'crypto'
-                asset['symbol'] = symbol[7:]  # Strip CRYPTO: prefix for display
-                asset['sp500'] = False
-            else:
-                asset['sp500'] = symbol in sp500_symbols_set
-                
-                is_forex = (
-                    len(symbol) == 6 and
-                    symbol[:3] in forex_currencies and
-                    symbol[3:] in forex_currencies
-                )
-                
-                if is_forex:
-                    asset['type'] = 'forex'
-                elif symbol in etf_symbols:
-                    asset['type'] = 'etf'
-                elif symbol in sp1500_symbols:
-                    asset['type'] = 'stock'
-                else:
-                    asset['type'] = 'stock'
-            
-            asset['name'] = name_lookup.get_name(asset['symbol'], asset['type'], config.MASSIVE_API_KEY)
-        
-        # Identify crypto assets for crypto explorer
-        crypto_rankings = [
-            asset for asset in all_rankings 
-            if asset.get('type') == 'crypto'
-        ]
+        crypto_rankings = tag_rankings(all_rankings)
         
         # Create big board with ALL assets
         big_board = all_rankings
@@ -430,13 +445,16 @@ def update_rankings(test_mode=False, asset_type=None, symbol=None, skip_crypto=F
         cache_manager.save()
         
         print("\n✅ Rankings updated successfully!")
-        print(f"📊 Total assets: {len(assets_data)} ({cache_manager.data['metadata']['stocks']} stocks, {cache_manager.data['metadata']['etfs']} ETFs, {cache_manager.data['metadata']['crypto']} crypto)")
+        metadata = cache_manager.data['metadata']
+        print(f"📊 Total assets: {metadata['total_assets']} ({metadata['stocks']} stocks, {metadata['etfs']} ETFs, {metadata['crypto']} crypto)")
         print(format_rankings_summary(big_board, top_n=10))
         
         return True
         
     except Exception as e:
         print(f"\n❌ Error updating rankings: {e}")
+        # Drop the half-applied assets and pending writes so refresh() can sync this worker again
+        cache_manager.load()
         return False
 
 def background_update_task(test_mode=False, asset_type=None, symbol=None, skip_crypto=False):
@@ -447,13 +465,6 @@ def background_update_task(test_mode=False, asset_type=None, symbol=None, skip_c
     global update_status
     
     try:
-        with update_lock:
-            update_status['is_running'] = True
-            update_status['started_at'] = datetime.now().isoformat()
-            update_status['progress'] = 0
-            update_status['current_task'] = 'Starting update...'
-            update_status['error'] = None
-        
         # Run the actual update
         update_rankings(test_mode=test_mode, asset_type=asset_type, symbol=symbol, skip_crypto=skip_crypto)
         
@@ -473,20 +484,85 @@ def background_update_task(test_mode=False, asset_type=None, symbol=None, skip_c
         
         print(f"❌ Background update failed: {e}")
 
+def claim_update_slot(task: str):
+    """
+    Mark an update as running - the single slot shared by /api/update, the
+    scheduler and /api/cron-update. Returns its job id, or None if one is already running
+    """
+    job_id = uuid.uuid4().hex
+    with update_lock:
+        if update_status['is_running']:
+            return None
+        update_status['is_running'] = True
+        update_status['job_id'] = job_id
+        update_status['started_at'] = datetime.now().isoformat()
+        update_status['progress'] = 0
+        update_status['current_task'] = task
+        update_status['error'] = None
+    return job_id
+
+def start_background_update(test_mode=False, asset_type=None, symbol=None, skip_crypto=False):
+    """
+    Claim the update slot and run background_update_task on a daemon thread
+    Returns the new job id, or None (without starting anything) if an update is already running
+    """
+    # Claimed before the thread starts so two quick triggers can't both start one
+    job_id = claim_update_slot('Starting update...')
+    if job_id is None:
+        return None
+    
+    # An explicit refresh always goes back to the network
+    ttl_cache.clear_all()
+    
+    thread = threading.Thread(
+        target=background_update_task,
+        args=(test_mode, asset_type, symbol, skip_crypto),
+        daemon=True
+    )
+    thread.start()
+    return job_id
+
+def scheduled_update_loop():
+    """
+    Start a full update every UPDATE_INTERVAL_HOURS (skipped if one is still running)
+    
+    The first one is timed from the saved rankings' last_update, so a restart
+    keeps the schedule and a cold start (nothing cached) loads straight away
+    instead of serving 503s for a whole interval
+    """
+    interval = config.UPDATE_INTERVAL_HOURS * 3600
+    last_update = cache_manager.data.get('last_update')
+    age = (datetime.now() - datetime.fromisoformat(last_update)).total_seconds() if last_update else interval
+    wait = min(max(0, interval - age), interval)
+    while True:
+        time.sleep(wait)
+        wait = interval
+        if start_background_update():
+            print("⏰ Scheduled update started")
+        else:
+            print("⏰ Scheduled update skipped - previous update still running")
+
+if config.AUTO_UPDATE:
+    threading.Thread(target=scheduled_update_loop, daemon=True).start()
+    print(f"⏰ Auto-update enabled: every {config.UPDATE_INTERVAL_HOURS}h")
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    big_board = cache.get('big_board') or []
-    crypto_explorer = cache.get('crypto_explorer') or []
+    big_board = cache_manager.data.get('big_board') or []
+    crypto_explorer = cache_manager.data.get('crypto_explorer') or []
     
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'last_update': cache.get('last_update'),
+        'last_update': cache_manager.data.get('last_update'),
         'big_board_assets': len(big_board),
         'crypto_assets': len(crypto_explorer),
         'massive_api': 'configured' if config.MASSIVE_API_KEY != 'YOUR_KEY_HERE' else 'not configured',
-        'data_loaded': cache.get('last_update') is not None
+        'data_loaded': cache_manager.data.get('last_update') is not None,
+        'providers': reliability.breaker_states(),
+        'update_running': update_status['is_running'],
+        'last_update_error': update_status['error']
     })
 
 @app.route('/api/cache/clear', methods=['POST'])
@@ -510,11 +586,11 @@ def cache_status():
     """Get detailed cache status"""
     import os
     assets_data = cache_manager.get_assets()
-    big_board = cache.get('big_board') or []
+    big_board = cache_manager.data.get('big_board') or []
     
     return jsonify({
         'timestamp': datetime.now().isoformat(),
-        'last_update': cache.get('last_update'),
+        'last_update': cache_manager.data.get('last_update'),
         'cache_file_exists': os.path.exists(cache_manager.cache_file),
         'assets_in_cache': len(assets_data),
         'big_board_rankings': len(big_board),
@@ -572,6 +648,66 @@ def test_market_cap_filter():
             'dry_run': True
         }), 500
 
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'  # No name/mtime, unknown OS
+
+def gzip_around(prefix: bytes, payload: bytes, deflated: bytes, suffix: bytes) -> bytes:
+    """
+    Gzip prefix + payload + suffix, where `deflated` is payload already compressed
+    as raw deflate ending in a sync flush - only prefix and suffix are compressed here
+    """
+    head = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    tail = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = zlib.crc32(suffix, zlib.crc32(payload, zlib.crc32(prefix)))
+    size = len(prefix) + len(payload) + len(suffix)
+    return b''.join([
+        GZIP_HEADER,
+        head.compress(prefix), head.flush(zlib.Z_SYNC_FLUSH),
+        deflated,
+        tail.compress(suffix), tail.flush(),
+        struct.pack('<II', crc, size & 0xffffffff)
+    ])
+
+def rankings_response(key: str) -> Response:
+    """
+    Build a rankings response from the pre-encoded payload (see CacheManager.get_rankings_json)
+    A limit is a zero-copy slice - only the small envelope is encoded per request.
+    Full lists go out gzipped (when accepted) from the pre-compressed payload.
+    The ETag changes with every rankings update, so revalidations get a bodiless 304.
+    """
+    last_update = cache_manager.data['last_update']
+    etag = hashlib.sha1(f"{key}:{last_update}".encode()).hexdigest()[:20]
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    payload, ends = cache_manager.get_rankings_json(key)
+    total = len(ends)
+    rankings = memoryview(payload)
+    
+    limit = request.args.get('limit', type=int)
+    if limit:
+        count = len(range(total)[:limit])  # Same semantics as list[:limit]
+        rankings = rankings[:ends[count - 1]] if count else b''
+    
+    prefix = b'{"rankings":['
+    suffix = b''.join([
+        b'],"total":', str(total).encode(),
+        b',"last_update":', json_codec.dumps(last_update),
+        b',"timestamp":', json_codec.dumps(datetime.now().isoformat()),
+        b'}'
+    ])
+    
+    if len(rankings) == len(payload) and 'gzip' in request.accept_encodings:
+        body = gzip_around(prefix, payload, cache_manager.get_rankings_deflate(key), suffix)
+        response = Response(body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(b''.join([prefix, rankings, suffix]), mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag, weak=True)
+    return response
+
 @app.route('/api/big-board', methods=['GET'])
 def get_big_board():
     """Get Big Board rankings"""
@@ -580,24 +716,13 @@ def get_big_board():
     
     # Optional filters
     asset_type = request.args.get('type')  # 'stocks', 'etfs', 'crypto'
-    limit = request.args.get('limit', type=int)
-    
-    results = cache_manager.data['big_board']
     
     # Apply filters (simplified for MVP)
     if asset_type:
         # Would filter by type
         pass
     
-    if limit:
-        results = results[:limit]
-    
-    return jsonify({
-        'rankings': results,
-        'total': len(cache_manager.data['big_board']),
-        'last_update': cache_manager.data['last_update'],
-        'timestamp': datetime.now().isoformat()
-    })
+    return rankings_response('big_board')
 
 @app.route('/api/crypto-explorer', methods=['GET'])
 def get_crypto_explorer():
@@ -605,30 +730,15 @@ def get_crypto_explorer():
     if not cache_manager.data.get('crypto_explorer'):
         return jsonify({'error': 'Data not yet loaded.'}), 503
     
-    limit = request.args.get('limit', type=int)
-    results = cache_manager.data['crypto_explorer']
-    
-    if limit:
-        results = results[:limit]
-    
-    return jsonify({
-        'rankings': results,
-        'total': len(cache_manager.data['crypto_explorer']),
-        'last_update': cache_manager.data['last_update'],
-        'timestamp': datetime.now().isoformat()
-    })
+    return rankings_response('crypto_explorer')
 
 @app.route('/api/asset/<symbol>', methods=['GET'])
 def get_asset(symbol):
     """Get individual asset details"""
     symbol = symbol.upper()
     
-    # Search in big board
-    asset = next((a for a in cache.get('big_board', []) if a['symbol'] == symbol), None)
-    
-    # Search in crypto explorer if not found
-    if not asset:
-        asset = next((a for a in cache.get('crypto_explorer', []) if a['symbol'] == symbol), None)
+    # Indexed lookup - big board first, then crypto explorer
+    asset = cache_manager.get_ranked_asset(symbol)
     
     if not asset:
         return jsonify({'error': f'Asset {symbol} not found'}), 404
@@ -637,13 +747,16 @@ def get_asset(symbol):
 
 @app.route('/api/network-test', methods=['GET'])
 def network_test():
-    """Test network connectivity"""
+    """Test network connectivity - only served when ENABLE_DIAGNOSTICS is set"""
+    if not config.ENABLE_DIAGNOSTICS:
+        return jsonify({'error': 'Not found'}), 404
+    
     import socket
     import requests
     
     results = {}
     
-    # Test DNS resolution
+    # Test DNS resolution - deliberately uncached, a stale answer would defeat the test
     try:
         ip = socket.gethostbyname('api.polygon.io')
         results['polygon_dns'] = f'✓ Resolved to {ip}'
@@ -656,9 +769,13 @@ def network_test():
     except Exception as e:
         results['binance_dns'] = f'✗ DNS failed: {str(e)}'
     
-    # Test HTTP connection
+    # Test HTTP connection - through Massive's pooled session, so the probe also warms the connection real fetches use
     try:
-        response = requests.get('https://api.polygon.io/v2/aggs/ticker/AAPL/range/1/day/2024-01-01/2024-01-10?apiKey=' + config.MASSIVE_API_KEY, timeout=5)
+        response = massive.session.get(
+            'https://api.polygon.io/v2/aggs/ticker/AAPL/range/1/day/2024-01-01/2024-01-10',
+            params={'apiKey': config.MASSIVE_API_KEY},
+            timeout=(config.CONNECT_TIMEOUT, 5)
+        )
         results['polygon_http'] = f'✓ HTTP {response.status_code}'
     except Exception as e:
         results['polygon_http'] = f'✗ HTTP failed: {str(e)}'
@@ -677,6 +794,14 @@ def cron_update():
     Automated update endpoint for cron jobs
     Does FAST incremental updates - recalculates rankings with existing cached data
     """
+    # Share the update slot - recomputing mid-update would rank half-replaced data
+    if claim_update_slot('Cron: recalculating rankings') is None:
+        return jsonify({
+            'status': 'already_running',
+            'message': 'Update already in progress - rankings will be recalculated when it finishes',
+            'check_status': '/api/update/status'
+        }), 409
+    
     try:
         print("\n🤖 CRON: Starting automated update...")
         
@@ -688,30 +813,10 @@ def cron_update():
         
         # Just recalculate rankings with existing data (FAST - ~10 seconds)
         print("🏆 Recalculating tournament rankings...")
-        all_rankings = calculate_tournament_rankings(existing_data)
-        
-        # Get symbols lists for categorization
-        stock_symbols = set(massive.get_sp500_symbols())
-        etf_symbols = set(massive.get_major_etfs())
-        all_crypto_symbols = {'BTC', 'ETH'}  # Just BTC + ETH
-        
-        # Add asset type and name to each ranking
-        for asset in all_rankings:
-            symbol = asset['symbol']
-            if symbol in all_crypto_symbols:
-                asset['type'] = 'crypto'
-            elif symbol in etf_symbols:
-                asset['type'] = 'etf'
-            elif symbol in stock_symbols:
-                asset['type'] = 'stock'
-            else:
-                asset['type'] = 'stock'
-            
-            # Add asset name
-            asset['name'] = name_lookup.get_name(symbol, asset['type'], config.MASSIVE_API_KEY)
+        all_rankings = calculate_tournament_rankings(existing_data, cache_manager.get_price_matrix())
         
-        # Identify crypto assets
-        crypto_rankings = [asset for asset in all_rankings if asset.get('type') == 'crypto']
+        # Add asset type, S&P 500 flag, and name to each ranking
+        crypto_rankings = tag_rankings(all_rankings)
         
         # Create big board with ALL assets (including all crypto)
         big_board = all_rankings
@@ -732,6 +837,11 @@ def cron_update():
     except Exception as e:
         print(f"🤖 CRON: Update failed - {e}")
         return jsonify({'error': str(e)}), 500
+    
+    finally:
+        with update_lock:
+            update_status['is_running'] = False
+            update_status['current_task'] = 'Cron recalculation finished'
 
 @app.route('/api/update', methods=['GET', 'POST'])
 def trigger_update():
@@ -752,17 +862,6 @@ def trigger_update():
     """
     global update_status
     
-    # Check if already running
-    with update_lock:
-        if update_status['is_running']:
-            return jsonify({
-                'status': 'already_running',
-                'message': 'Update already in progress',
-                'started_at': update_status['started_at'],
-                'current_task': update_status['current_task'],
-                'check_status': '/api/update/status'
-            }), 409
-    
     # Parse parameters
     test_mode = request.args.get('test', '').lower() == 'true'
     asset_type = request.args.get('type', '').lower() or None
@@ -786,13 +885,18 @@ def trigger_update():
     if asset_type and asset_type not in ['stocks', 'etfs', 'crypto']:
         return jsonify({'error': 'Invalid type. Must be: stocks, etfs, or crypto'}), 400
     
-    # Start background thread
-    thread = threading.Thread(
-        target=background_update_task,
-        args=(test_mode, asset_type, symbol, skip_crypto),
-        daemon=True
-    )
-    thread.start()
+    # Start background thread (or report the one already running)
+    job_id = start_background_update(test_mode, asset_type, symbol, skip_crypto)
+    if job_id is None:
+        with update_lock:
+            return jsonify({
+                'status': 'already_running',
+                'message': 'Update already in progress',
+                'job_id': update_status['job_id'],
+                'started_at': update_status['started_at'],
+                'current_task': update_status['current_task'],
+                'check_status': f"/api/update/status/{update_status['job_id']}"
+            }), 409
     
     # Build response message
     if symbol:
@@ -807,19 +911,24 @@ def trigger_update():
     return jsonify({
         'status': 'started',
         'message': f'{mode_msg} started in background',
+        'job_id': job_id,
         'started_at': datetime.now().isoformat(),
-        'check_status': '/api/update/status',
+        'check_status': f'/api/update/status/{job_id}',
         'note': 'This endpoint returns immediately. Check /api/update/status to monitor progress.'
-    })
+    }), 202
 
 @app.route('/api/update/status', methods=['GET'])
-def update_progress():
+@app.route('/api/update/status/<job_id>', methods=['GET'])
+def update_progress(job_id=None):
     """
-    Check status of background update
+    Check status of background update (optionally a specific job from /api/update)
     """
     with update_lock:
         status_copy = update_status.copy()
     
+    if job_id is not None and job_id != status_copy['job_id']:
+        return jsonify({'error': f'Unknown job {job_id} - only the latest update is tracked'}), 404
+    
     # Add helpful messages
     if status_copy['is_running']:
         status_copy['message'] = 'Update in progress - check back in a few minutes'
@@ -832,6 +941,70 @@ def update_progress():
     
     return jsonify(status_copy)
 
+GRIDS = {
+    'mag7': ['AAPL', 'AMZN', 'GOOGL', 'META', 'MSFT', 'NVDA', 'TSLA'],
+    'indices': ['SPY', 'QQQ', 'DIA', 'GLD', 'SLV', 'IBIT', 'ETHA'],
+    'commodity': ['GLD', 'SLV', 'USO', 'UNG', 'CORN', 'WEAT', 'SOYB'],
+    'crypto': ['BTC', 'ETH', 'BNB', 'SOL', 'HYPE', 'XRP', 'DOGE'],
+    'forex': ['USD', 'EUR', 'JPY', 'CAD', 'AUD', 'GBP', 'CHF']
+}
+
+@ttl_cache.ttl_lru_cache(maxsize=16, ttl=config.CACHE_TTL_SECONDS)
+def build_grid_matchups(grid_type: str, last_update: str) -> dict:
+    """
+    W/L matchups for one grid - memoized per rankings update (last_update is part of the key)
+    """
+    from tournament import build_price_matrix, win_matrix
+    
+    symbols = GRIDS[grid_type]
+    assets_data = cache_manager.get_assets()
+    
+    # Every non-forex matchup in one vectorized pass - try plain symbol first, then CRYPTO: prefix
+    if grid_type != 'forex':
+        prices, row_of = build_price_matrix({
+            symbol: assets_data.get(symbol) or assets_data.get(f"CRYPTO:{symbol}", [])
+            for symbol in symbols
+        })
+        wins = win_matrix(prices)
+    
+    matchups = {}
+    
+    for symbol1 in symbols:
+        matchups[symbol1] = {}
+        
+        for symbol2 in symbols:
+            if symbol1 == symbol2:
+                matchups[symbol1][symbol2] = '-'
+                continue
+            
+            # For forex: construct the synthetic pair from the two currency codes
+            # e.g. EUR vs USD → look up EURUSD in assets_data
+            if grid_type == 'forex':
+                pair = f"{symbol1}{symbol2}"
+                prices1 = assets_data.get(pair, [])
+                # symbol1 wins if the pair is above its own 20w MA
+                if len(prices1) < config.MA_PERIOD:
+                    matchups[symbol1][symbol2] = 'N/A'
+                    continue
+                ma = sum(prices1[:config.MA_PERIOD]) / config.MA_PERIOD
+                if prices1[0] > ma:
+                    matchups[symbol1][symbol2] = {'result': 'W'}
+                else:
+                    matchups[symbol1][symbol2] = {'result': 'L'}
+                continue
+            
+            # For all other grids: missing or short histories have no row
+            if symbol1 not in row_of or symbol2 not in row_of:
+                matchups[symbol1][symbol2] = 'N/A'
+                continue
+            
+            if wins[row_of[symbol1], row_of[symbol2]]:
+                matchups[symbol1][symbol2] = {'result': 'W'}
+            else:
+                matchups[symbol1][symbol2] = {'result': 'L'}
+    
+    return matchups
+
 @app.route('/api/grid/<grid_type>', methods=['GET'])
 def get_grid(grid_type):
     """
@@ -839,84 +1012,13 @@ def get_grid(grid_type):
     Returns TRUE synthetic pair W/L results
     """
     try:
-        from tournament import wins_matchup
-        
-        # Define grid symbols
-        grids = {
-            'mag7': ['AAPL', 'AMZN', 'GOOGL', 'META', 'MSFT', 'NVDA', 'TSLA'],
-            'indices': ['SPY', 'QQQ', 'DIA', 'GLD', 'SLV', 'IBIT', 'ETHA'],
-            'commodity': ['GLD', 'SLV', 'USO', 'UNG', 'CORN', 'WEAT', 'SOYB'],
-            'crypto': ['BTC', 'ETH', 'BNB', 'SOL', 'HYPE', 'XRP', 'DOGE'],
-            'forex': ['USD', 'EUR', 'JPY', 'CAD', 'AUD', 'GBP', 'CHF']
-        }
-        
-        if grid_type not in grids:
+        if grid_type not in GRIDS:
             return jsonify({'error': 'Invalid grid type'}), 400
         
-        symbols = grids[grid_type]
+        symbols = GRIDS[grid_type]
         print(f"Processing grid for {grid_type}: {symbols}")
         
-        # Get price histories from cache
-        assets_data = cache_manager.get_assets()
-        
-        # Calculate matchups
-        matchups = {}
-        
-        for symbol1 in symbols:
-            matchups[symbol1] = {}
-            
-            for symbol2 in symbols:
-                if symbol1 == symbol2:
-                    matchups[symbol1][symbol2] = '-'
-                    continue
-                
-                # For forex: construct the synthetic pair from the two currency codes
-                # e.g. EUR vs USD → look up EURUSD in assets_data
-                if grid_type == 'forex':
-                    pair = f"{symbol1}{symbol2}"
-                    prices1 = assets_data.get(pair, [])
-                    prices2 = [1.0 / p for p in prices1 if p != 0] if prices1 else []
-                    # For forex we just need prices1 (the pair) - symbol1 wins if pair > MA
-                    # We'll compare pair vs its own MA directly
-                    if not prices1:
-                        matchups[symbol1][symbol2] = 'N/A'
-                        continue
-                    if len(prices1) < config.MA_PERIOD:
-                        matchups[symbol1][symbol2] = 'N/A'
-                        continue
-                    try:
-                        # symbol1 wins if SYMBOL1SYMBOL2 pair is above its 20w MA
-                        ma = sum(prices1[:config.MA_PERIOD]) / config.MA_PERIOD
-                        current = prices1[0]
-                        if current > ma:
-                            matchups[symbol1][symbol2] = {'result': 'W'}
-                        else:
-                            matchups[symbol1][symbol2] = {'result': 'L'}
-                    except Exception as e:
-                        matchups[symbol1][symbol2] = 'N/A'
-                    continue
-                
-                # For all other grids: try plain symbol first, then CRYPTO: prefix
-                prices1 = assets_data.get(symbol1) or assets_data.get(f"CRYPTO:{symbol1}", [])
-                prices2 = assets_data.get(symbol2) or assets_data.get(f"CRYPTO:{symbol2}", [])
-                
-                if not prices1 or not prices2:
-                    matchups[symbol1][symbol2] = 'N/A'
-                    continue
-                
-                if len(prices1) < config.MA_PERIOD or len(prices2) < config.MA_PERIOD:
-                    matchups[symbol1][symbol2] = 'N/A'
-                    continue
-                
-                try:
-                    asset1_wins = wins_matchup(prices1, prices2)
-                    if asset1_wins:
-                        matchups[symbol1][symbol2] = {'result': 'W'}
-                    else:
-                        matchups[symbol1][symbol2] = {'result': 'L'}
-                except Exception as e:
-                    print(f"Error comparing {symbol1} vs {symbol2}: {e}")
-                    matchups[symbol1][symbol2] = {'result': 'T'}
+        matchups = build_grid_matchups(grid_type, cache_manager.data.get('last_update'))
         
         print(f"Grid calculation complete: {len(matchups)} rows")
         
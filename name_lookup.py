@@ -2,183 +2,206 @@
 Asset Name Lookup
 Fetches and caches asset names from APIs
 """
-import requests
-import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+import http_utils
+import json_codec
+
+# Crypto names - if asset_type is crypto, ONLY use this dict, never hit stock API
+CRYPTO_NAMES = {
+    'BTC': 'Bitcoin',
+    'ETH': 'Ethereum',
+    'USDT': 'Tether',
+    'BNB': 'Binance Coin',
+    'SOL': 'Solana',
+    'USDC': 'USD Coin',
+    'XRP': 'XRP',
+    'DOGE': 'Dogecoin',
+    'ADA': 'Cardano',
+    'TRX': 'TRON',
+    'AVAX': 'Avalanche',
+    'SHIB': 'Shiba Inu',
+    'TON': 'Toncoin',
+    'LINK': 'Chainlink',
+    'DOT': 'Polkadot',
+    'BCH': 'Bitcoin Cash',
+    'LTC': 'Litecoin',
+    'UNI': 'Uniswap',
+    'NEAR': 'NEAR Protocol',
+    'ICP': 'Internet Computer',
+    'PEPE': 'Pepe',
+    'HBAR': 'Hedera',
+    'APT': 'Aptos',
+    'FET': 'Fetch.ai',
+    'ETC': 'Ethereum Classic',
+    'STX': 'Stacks',
+    'XLM': 'Stellar',
+    'INJ': 'Injective',
+    'CRO': 'Cronos',
+    'RNDR': 'Render',
+    'ATOM': 'Cosmos',
+    'ARB': 'Arbitrum',
+    'IMX': 'Immutable',
+    'OP': 'Optimism',
+    'MKR': 'Maker',
+    'FIL': 'Filecoin',
+    'VET': 'VeChain',
+    'RUNE': 'THORChain',
+    'XMR': 'Monero',
+    'ALGO': 'Algorand',
+    'AAVE': 'Aave',
+    'GRT': 'The Graph',
+    'THETA': 'Theta Network',
+    'FTM': 'Fantom',
+    'SAND': 'The Sandbox',
+    'MANA': 'Decentraland',
+    'EOS': 'EOS',
+    'FLOW': 'Flow',
+    'XTZ': 'Tezos',
+    'AXS': 'Axie Infinity',
+    'EGLD': 'MultiversX',
+    'FLOKI': 'Floki',
+    'CHZ': 'Chiliz',
+    'NEO': 'NEO',
+    'MINA': 'Mina Protocol',
+    'KAVA': 'Kava',
+    'SNX': 'Synthetix',
+    'GALA': 'Gala',
+    'QNT': 'Quant',
+    'CFX': 'Conflux',
+    'FLR': 'Flare',
+    'ZEC': 'Zcash',
+    'DASH': 'Dash',
+    'COMP': 'Compound',
+    'LDO': 'Lido DAO',
+    'ENJ': 'Enjin Coin',
+    'CAKE': 'PancakeSwap',
+    'BAT': 'Basic Attention Token',
+    'ZIL': 'Zilliqa',
+    'CRV': 'Curve DAO',
+    'YFI': 'Yearn Finance',
+    'GMT': 'STEPN',
+    'HNT': 'Helium',
+    'SUSHI': 'SushiSwap',
+    'CVX': 'Convex Finance',
+    'DYDX': 'dYdX',
+    'KSM': 'Kusama',
+    'MASK': 'Mask Network',
+    'RAY': 'Raydium',
+    'HYPE': 'Hyperliquid',
+    'LEO': 'UNUS SED LEO',
+    'SUI': 'Sui',
+    'MNT': 'Mantle',
+    'VVV': 'Virtual Protocol',
+    'DEXE': 'DeXe',
+    'TAO': 'Bittensor',
+    'ASTR': 'Astar',
+    'POL': 'Polygon',
+    'MATIC': 'Polygon',
+    'WIF': 'dogwifhat',
+    'BONK': 'Bonk',
+    'TIA': 'Celestia',
+    'SEI': 'Sei',
+    'JUP': 'Jupiter',
+    'WLD': 'Worldcoin',
+    'PYTH': 'Pyth Network',
+    'STRK': 'Starknet',
+    'BLUR': 'Blur',
+    'ENS': 'Ethereum Name Service',
+    'LRC': 'Loopring',
+    '1INCH': '1inch',
+    'OCEAN': 'Ocean Protocol',
+}
+
+MISS_TTL_SECONDS = 86400  # Don't re-ask the API about a symbol with no name for a day
+LISTING_MIN_SYMBOLS = 100  # Cold batches this big page through the ticker listing instead
+
+TICKERS_URL = 'https://api.polygon.io/v3/reference/tickers'
 
 class NameLookup:
     def __init__(self, cache_file='asset_names.json'):
         self.cache_file = cache_file
+        self.session = http_utils.create_session(pool_size=8)  # One keep-alive connection per bulk_fetch worker
         self.names = {}
+        self.misses = {}      # {symbol: time of the failed lookup} - not persisted
+        self._unsaved = False  # names added since the last save
         self.load()
     
     def load(self):
         """Load cached names from disk"""
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r') as f:
-                    self.names = json.load(f)
+                with open(self.cache_file, 'rb') as f:
+                    self.names = json_codec.loads(f.read())
                 print(f"✓ Loaded {len(self.names)} asset names from cache")
-            except:
-                pass
+            except Exception as e:
+                print(f"✗ Error loading asset names ({e}) - starting with an empty name cache")
     
     def save(self):
-        """Save names to disk"""
+        """Save names to disk (a no-op when nothing was added)"""
+        if not self._unsaved:
+            return
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.names, f, indent=2)
-        except:
-            pass
+            # Write then rename, so a crash mid-write can't leave a truncated file that loads as no names
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(json_codec.dumps(self.names))
+            os.replace(tmp_file, self.cache_file)
+            self._unsaved = False
+        except Exception as e:
+            print(f"✗ Error saving asset names: {e}")
     
     def get_name(self, symbol: str, asset_type: str = None, api_key: str = None) -> str:
         """
         Get asset name for symbol
-        Returns cached name or fetches from API
+        Returns cached name or fetches from API - call save() once after a batch of lookups
         """
         # For crypto: always use the hardcoded dict, never trust cached stock names
         if asset_type == 'crypto':
-            return self._fetch_name(symbol, asset_type, api_key)
+            return CRYPTO_NAMES.get(symbol, symbol)
         
         # Check cache first for non-crypto
         if symbol in self.names:
             return self.names[symbol]
         
+        # Recently failed - don't hit the API again every update
+        if time.time() - self.misses.get(symbol, 0) < MISS_TTL_SECONDS:
+            return symbol
+        
         # Fetch from API
         name = self._fetch_name(symbol, asset_type, api_key)
         
         # Cache it
         if name:
             self.names[symbol] = name
-            self.save()
+            self._unsaved = True
+        else:
+            self.misses[symbol] = time.time()
         
         return name or symbol  # Return symbol if no name found
     
     def _fetch_name(self, symbol: str, asset_type: str = None, api_key: str = None) -> str:
         """Fetch name from appropriate API"""
         
-        # Crypto names - if asset_type is crypto, ONLY use this dict, never hit stock API
-        crypto_names = {
-            'BTC': 'Bitcoin',
-            'ETH': 'Ethereum',
-            'USDT': 'Tether',
-            'BNB': 'Binance Coin',
-            'SOL': 'Solana',
-            'USDC': 'USD Coin',
-            'XRP': 'XRP',
-            'DOGE': 'Dogecoin',
-            'ADA': 'Cardano',
-            'TRX': 'TRON',
-            'AVAX': 'Avalanche',
-            'SHIB': 'Shiba Inu',
-            'TON': 'Toncoin',
-            'LINK': 'Chainlink',
-            'DOT': 'Polkadot',
-            'BCH': 'Bitcoin Cash',
-            'LTC': 'Litecoin',
-            'UNI': 'Uniswap',
-            'NEAR': 'NEAR Protocol',
-            'ICP': 'Internet Computer',
-            'PEPE': 'Pepe',
-            'HBAR': 'Hedera',
-            'APT': 'Aptos',
-            'FET': 'Fetch.ai',
-            'ETC': 'Ethereum Classic',
-            'STX': 'Stacks',
-            'XLM': 'Stellar',
-            'INJ': 'Injective',
-            'CRO': 'Cronos',
-            'RNDR': 'Render',
-            'ATOM': 'Cosmos',
-            'ARB': 'Arbitrum',
-            'IMX': 'Immutable',
-            'OP': 'Optimism',
-            'MKR': 'Maker',
-            'FIL': 'Filecoin',
-            'VET': 'VeChain',
-            'RUNE': 'THORChain',
-            'XMR': 'Monero',
-            'ALGO': 'Algorand',
-            'AAVE': 'Aave',
-            'GRT': 'The Graph',
-            'THETA': 'Theta Network',
-            'FTM': 'Fantom',
-            'SAND': 'The Sandbox',
-            'MANA': 'Decentraland',
-            'EOS': 'EOS',
-            'FLOW': 'Flow',
-            'XTZ': 'Tezos',
-            'AXS': 'Axie Infinity',
-            'EGLD': 'MultiversX',
-            'FLOKI': 'Floki',
-            'CHZ': 'Chiliz',
-            'NEO': 'NEO',
-            'MINA': 'Mina Protocol',
-            'KAVA': 'Kava',
-            'SNX': 'Synthetix',
-            'GALA': 'Gala',
-            'QNT': 'Quant',
-            'CFX': 'Conflux',
-            'FLR': 'Flare',
-            'ZEC': 'Zcash',
-            'DASH': 'Dash',
-            'COMP': 'Compound',
-            'LDO': 'Lido DAO',
-            'ENJ': 'Enjin Coin',
-            'CAKE': 'PancakeSwap',
-            'BAT': 'Basic Attention Token',
-            'ZIL': 'Zilliqa',
-            'CRV': 'Curve DAO',
-            'YFI': 'Yearn Finance',
-            'GMT': 'STEPN',
-            'HNT': 'Helium',
-            'SUSHI': 'SushiSwap',
-            'CVX': 'Convex Finance',
-            'DYDX': 'dYdX',
-            'KSM': 'Kusama',
-            'MASK': 'Mask Network',
-            'RAY': 'Raydium',
-            'HYPE': 'Hyperliquid',
-            'LEO': 'UNUS SED LEO',
-            'SUI': 'Sui',
-            'MNT': 'Mantle',
-            'VVV': 'Virtual Protocol',
-            'DEXE': 'DeXe',
-            'TAO': 'Bittensor',
-            'ASTR': 'Astar',
-            'POL': 'Polygon',
-            'MATIC': 'Polygon',
-            'WIF': 'dogwifhat',
-            'BONK': 'Bonk',
-            'TIA': 'Celestia',
-            'SEI': 'Sei',
-            'JUP': 'Jupiter',
-            'WLD': 'Worldcoin',
-            'PYTH': 'Pyth Network',
-            'STRK': 'Starknet',
-            'BLUR': 'Blur',
-            'ENS': 'Ethereum Name Service',
-            'LRC': 'Loopring',
-            '1INCH': '1inch',
-            'OCEAN': 'Ocean Protocol',
-        }
-        
         if asset_type == 'crypto':
             # Never hit stock API for crypto - return from dict or fallback to symbol
-            return crypto_names.get(symbol, symbol)
+            return CRYPTO_NAMES.get(symbol, symbol)
         
         # Also check dict for any symbol that happens to be in it
-        if symbol in crypto_names and asset_type != 'stock':
-            return crypto_names[symbol]
+        if symbol in CRYPTO_NAMES and asset_type != 'stock':
+            return CRYPTO_NAMES[symbol]
         
         # Stocks/ETFs - use Polygon API
         if api_key:
             try:
-                url = f"https://api.polygon.io/v3/reference/tickers/{symbol}"
+                url = f"{TICKERS_URL}/{symbol}"
                 params = {'apiKey': api_key}
-                response = requests.get(url, params=params, timeout=5)
+                response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 5))
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = json_codec.loads(response.content)
                     if 'results' in data and 'name' in data['results']:
                         return data['results']['name']
             except:
@@ -186,23 +209,66 @@ class NameLookup:
         
         return None
     
-    def bulk_fetch(self, symbols: list, api_key: str = None):
+    def _fetch_names_listing(self, symbols: list, api_key: str) -> dict:
         """
-        Fetch names for multiple symbols
-        Only fetches uncached ones
+        Walk Polygon's active stock/ETF ticker listing (1000 per page) until every
+        symbol is found - about a dozen calls instead of one per symbol
+        Returns {symbol: name} for the symbols found (empty if the listing fails)
         """
-        to_fetch = [s for s in symbols if s not in self.names]
+        wanted = set(symbols)
+        found = {}
+        url = TICKERS_URL
+        params = {'market': 'stocks', 'active': 'true', 'limit': 1000, 'apiKey': api_key}
+        try:
+            while url and len(found) < len(wanted):
+                response = self.session.get(url, params=params, timeout=(config.CONNECT_TIMEOUT, 15))
+                response.raise_for_status()
+                data = json_codec.loads(response.content)
+                for result in data.get('results', []):
+                    if result.get('ticker') in wanted and result.get('name'):
+                        found[result['ticker']] = result['name']
+                url = data.get('next_url')
+                params = {'apiKey': api_key}  # next_url carries the rest
+        except Exception as e:
+            print(f"  ⚠️  Ticker listing failed ({e}) - looking names up one by one")
+        return found
+    
+    def bulk_fetch(self, symbols: list, api_key: str = None, asset_type: str = None, max_workers: int = 8):
+        """
+        Fetch names for multiple symbols in parallel
+        Only fetches uncached ones (recent misses are skipped too, like get_name)
+        """
+        now = time.time()
+        to_fetch = [s for s in dict.fromkeys(symbols)
+                    if s not in self.names and now - self.misses.get(s, 0) >= MISS_TTL_SECONDS]
+        if not to_fetch:
+            return
+        
+        total = len(to_fetch)
+        print(f"Fetching names for {total} assets...")
         
-        print(f"Fetching names for {len(to_fetch)} assets...")
+        # Big cold batches: one paged listing first, per-symbol lookups only for what it misses.
+        # Crypto-named symbols keep the per-symbol path so _fetch_name's dict rules still apply
+        if api_key and len(to_fetch) >= LISTING_MIN_SYMBOLS:
+            listed = self._fetch_names_listing(
+                [s for s in to_fetch if asset_type == 'stock' or s not in CRYPTO_NAMES], api_key)
+            if listed:
+                self.names.update(listed)
+                self._unsaved = True
+            to_fetch = [s for s in to_fetch if s not in listed]
         
-        for i, symbol in enumerate(to_fetch):
-            name = self._fetch_name(symbol, api_key=api_key)
-            if name:
-                self.names[symbol] = name
-            
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i + 1}/{len(to_fetch)}...")
-                self.save()  # Save periodically
+        # Lookups are network-bound - threads overlap them; results are stored from this thread only
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            names = executor.map(lambda symbol: self._fetch_name(symbol, asset_type, api_key), to_fetch)
+            for i, (symbol, name) in enumerate(zip(to_fetch, names)):
+                if name:
+                    self.names[symbol] = name
+                    self._unsaved = True
+                else:
+                    self.misses[symbol] = time.time()
+                
+                if (i + 1) % 50 == 0:
+                    print(f"  Processed {i + 1}/{len(to_fetch)}...")
         
-        self.save()
-        print(f"✓ Fetched {len(to_fetch)} names")
+        self.save()  # One write for the whole batch
+        print(f"✓ Fetched {total} names")
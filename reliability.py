@@ -0,0 +1,88 @@
+"""
+Reliability
+Per-provider circuit breakers, so a degraded upstream fails fast instead of
+every symbol waiting out its own timeouts and retries
+"""
+import threading
+import time
+from typing import Dict
+import requests
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+def is_provider_failure(error: BaseException) -> bool:
+    """
+    True for errors that say the provider itself is unhealthy (connection
+    failures, timeouts, 429/5xx) - not for a bad symbol or missing data
+    """
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+class CircuitBreaker:
+    """
+    CLOSED -> OPEN after `failure_threshold` consecutive provider failures.
+    While OPEN every call fails immediately with CircuitOpenError; after
+    `recovery_timeout` seconds one trial call is let through (HALF_OPEN) and
+    its outcome closes or re-opens the circuit.
+
+    Use as a context manager around the provider call:
+        with breaker:
+            response = session.get(...)
+            response.raise_for_status()
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            if self.state == 'closed':
+                return self
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = 'half_open'  # This caller is the trial
+                return self
+        raise CircuitOpenError(f"{self.name} circuit open - skipping call")
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and is_provider_failure(exc):
+            self.record_failure()
+        else:
+            self.record_success()
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = 'closed'
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                if self.state != 'open':
+                    print(f"⚠️  {self.name} circuit opened after {self._failures} failures")
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the shared breaker for a provider ('massive', 'cryptocompare', ...)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def breaker_states() -> Dict[str, str]:
+    """{provider: 'closed'|'open'|'half_open'} for health reporting"""
+    return {name: breaker.state for name, breaker in _breakers.items()}
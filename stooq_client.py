@@ -2,16 +2,20 @@
 Stooq.com API Client
 Handles forex pairs data
 """
-import requests
 from datetime import datetime
 from typing import List
 import io
 import csv
+import http_utils
+import ttl_cache
+import config
 
 class StooqClient:
     def __init__(self):
         self.base_url = 'https://stooq.com/q/d/l'
+        self.session = http_utils.create_session()
     
+    @ttl_cache.ttl_lru_cache(maxsize=512, ttl=config.CACHE_TTL_SECONDS)
     def get_weekly_data(self, pair: str, weeks: int = 20) -> List[float]:
         """
         Get weekly closing prices for a forex pair
@@ -29,7 +33,7 @@ class StooqClient:
         url = f"{self.base_url}/?s={symbol}&i=w"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=(config.CONNECT_TIMEOUT, 10))
             response.raise_for_status()
             
             # Parse CSV data
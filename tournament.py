@@ -3,8 +3,19 @@ Tournament Ranking Algorithm
 Calculates relative strength using synthetic pair ratios vs ratio MAs
 """
 from typing import List, Dict, Tuple
+import hashlib
+import numpy as np
 import config
 
+try:
+    import numba
+    prange = numba.prange
+except ImportError:
+    numba = None
+    prange = range
+
+TOURNAMENT_TILE = 512  # Rows per parallel block in the Numba kernel
+
 def calculate_sma(prices: List[float], period: int) -> float:
     """Calculate Simple Moving Average"""
     if len(prices) < period:
@@ -129,87 +140,236 @@ def calculate_individual_ma_distance(prices: List[float]) -> Dict:
         'weeks_trending': weeks_trending
     }
 
-def calculate_tournament_rankings(assets_data: Dict[str, List[float]]) -> List[Dict]:
+def _sorted_price_matrix(symbols: List[str], price_matrix: Tuple[List[str], np.ndarray] = None, assets_data: Dict[str, List[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lay out prices as one (N, MA_PERIOD) PRICE_DTYPE matrix with rows in `symbols` order
+    
+    Rows come from price_matrix (symbols, prices) when given - e.g.
+    CacheManager.get_price_matrix() - otherwise from assets_data.
+    Assets with fewer than MA_PERIOD weeks get a zero row and valid=False.
+    
+    Returns: (prices, valid)
+    """
+    prices = np.zeros((len(symbols), config.MA_PERIOD), dtype=config.PRICE_DTYPE)
+    valid = np.zeros(len(symbols), dtype=bool)
+    
+    if price_matrix is not None:
+        row_of = {symbol: i for i, symbol in enumerate(price_matrix[0])}
+        rows = [(i, row_of[s]) for i, s in enumerate(symbols) if s in row_of]
+        if rows:
+            dst, src = np.array(rows).T
+            prices[dst] = price_matrix[1][src]
+            valid[dst] = True
+    else:
+        for i, symbol in enumerate(symbols):
+            history = assets_data[symbol]
+            if len(history) >= config.MA_PERIOD:
+                prices[i] = history[:config.MA_PERIOD]
+                valid[i] = True
+    
+    return prices, valid
+
+def build_price_matrix(assets_data: Dict[str, List[float]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Stack the newest MA_PERIOD weeks of every asset into one (N, MA_PERIOD) matrix
+    Assets with fewer weeks are left out
+    
+    Returns: (prices, {symbol: row})
+    """
+    symbols = [s for s, history in assets_data.items() if len(history) >= config.MA_PERIOD]
+    prices, _ = _sorted_price_matrix(symbols, assets_data=assets_data)
+    return prices, {symbol: i for i, symbol in enumerate(symbols)}
+
+def win_matrix(prices: np.ndarray) -> np.ndarray:
+    """
+    wins_matchup for every ordered pair of rows at once
+    Returns an (N, N) bool matrix where [a, b] is True if row a beats row b
+    (the diagonal is meaningless)
+    """
+    has_zero = (prices == 0).any(axis=1)  # A zero in B's window means B wins by default
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = prices[:, None, :] / prices[None, :, :]
+        ratio_sum = ratios[..., 0].copy()
+        for week in range(1, config.MA_PERIOD):  # In week order, like calculate_sma
+            ratio_sum += ratios[..., week]
+        wins = ratios[..., 0] >= ratio_sum / config.MA_PERIOD
+    
+    wins &= ~has_zero[None, :]
+    return wins
+
+def _tournament_wins(prices: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Count tournament wins for every row of a price matrix whose rows are
+    sorted by symbol, applying wins_matchup to each pair exactly once
+    
+    Row i plays every later row j as "asset A" (the same orientation as the
+    asset_a < asset_b rule), one vectorized row against the rest at a time.
+    The ratio MA is summed week by week in order, like calculate_sma, so the
+    results match wins_matchup exactly, ties and invalid assets included.
+    """
+    n = len(prices)
+    wins = np.zeros(n, dtype=np.int64)
+    has_zero = (prices == 0).any(axis=1)  # A zero in B's window means B wins by default
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(n - 1):
+            ratios = prices[i] / prices[i + 1:]
+            ratio_sum = ratios[:, 0].copy()
+            for week in range(1, config.MA_PERIOD):
+                ratio_sum += ratios[:, week]
+            a_wins = ratios[:, 0] >= ratio_sum / config.MA_PERIOD
+            a_wins &= valid[i] & valid[i + 1:] & ~has_zero[i + 1:]
+            
+            wins[i] += np.count_nonzero(a_wins)
+            wins[i + 1:] += ~a_wins
+    
+    return wins
+
+def _matchup_kernel(prices: np.ndarray, valid: np.ndarray, divisor_ok: np.ndarray, a: int, b: int) -> bool:
+    """
+    wins_matchup for rows a and b of the price matrix, as plain loops for Numba
+    divisor_ok[b] is valid[b] with no zero in its window, so the week loop has no branches
+    """
+    if not (valid[a] and divisor_ok[b]):
+        return False
+    
+    weeks = prices.shape[1]
+    ratio_sum = 0.0
+    for week in range(weeks):
+        ratio_sum += prices[a, week] / prices[b, week]
+    
+    return prices[a, 0] / prices[b, 0] >= ratio_sum / weeks
+
+def _tournament_wins_kernel(prices: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Same result as _tournament_wins, written as plain loops for Numba
+    
+    Each pair is evaluated once (upper triangle, row i as "asset A") in
+    parallel over a tile of TOURNAMENT_TILE rows into a (tile, N) beats
+    buffer; a cheap serial pass then credits every pair's winner before the
+    next tile, so memory stays O(tile * N) rather than O(N^2). No fastmath:
+    the ratio MA must be summed in week order to match wins_matchup.
+    """
+    n, weeks = prices.shape
+    tile = max(1, min(TOURNAMENT_TILE, n))
+    
+    # A zero in B's window means B wins by default - checked once per row, not per pair
+    divisor_ok = valid.copy()
+    for b in range(n):
+        for week in range(weeks):
+            if prices[b, week] == 0:
+                divisor_ok[b] = False
+    
+    # Each row only writes and reads its own j > i cells, so the buffer is reused without clearing
+    beats = np.zeros((tile, n), dtype=np.bool_)
+    wins = np.zeros(n, dtype=np.int64)
+    for start in range(0, n, tile):
+        rows = min(tile, n - start)
+        for r in prange(rows):
+            i = start + r
+            for j in range(i + 1, n):
+                beats[r, j] = _matchup_kernel(prices, valid, divisor_ok, i, j)
+        
+        for r in range(rows):
+            i = start + r
+            for j in range(i + 1, n):
+                if beats[r, j]:
+                    wins[i] += 1
+                else:
+                    wins[j] += 1
+    
+    return wins
+
+if numba is not None:
+    _matchup_kernel = numba.njit(cache=True)(_matchup_kernel)
+    _tournament_wins_jit = numba.njit(parallel=True, cache=True)(_tournament_wins_kernel)
+
+_last_wins = (None, None)  # (input digest, wins) of the most recent tournament
+
+def _cached_tournament_wins(order: List[str], prices: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Win counts for a sorted price matrix, reusing the last result when the
+    symbols and prices are byte-for-byte unchanged (e.g. a cron recompute
+    with no new data) instead of replaying every matchup
+    """
+    global _last_wins
+    digest = hashlib.blake2b('\0'.join(order).encode())
+    digest.update(prices.tobytes())
+    digest.update(valid.tobytes())
+    key = digest.digest()
+    
+    if _last_wins[0] == key:
+        print("  Prices unchanged since the last tournament - reusing its results")
+        return _last_wins[1]
+    
+    if numba is not None:
+        wins = _tournament_wins_jit(prices, valid)
+    else:
+        wins = _tournament_wins(prices, valid)
+    _last_wins = (key, wins)
+    return wins
+
+def calculate_tournament_rankings(assets_data: Dict[str, List[float]], price_matrix: Tuple[List[str], np.ndarray] = None) -> List[Dict]:
     """
     Run full tournament: every asset vs every other asset
     
     Args:
         assets_data: Dict of {symbol: [weekly_closes]}
+        price_matrix: Optional (symbols, prices) matrix of the same data,
+            e.g. CacheManager.get_price_matrix(), to skip rebuilding it
         
     Returns:
         List of assets ranked by tournament wins
     """
     symbols = list(assets_data.keys())
+    num_assets = len(symbols)
+    
+    # Run tournament (all pairwise matchups) on one matrix, rows in symbol order
+    print(f"\n🏆 Running tournament with {num_assets} assets...")
+    print(f"Total matchups: {num_assets * (num_assets - 1):,}")
     
-    # Initialize win counts
+    order = sorted(symbols)
+    prices, valid = _sorted_price_matrix(order, price_matrix, assets_data)
+    wins = _cached_tournament_wins(order, prices, valid)
+    wins_by_symbol = dict(zip(order, wins.tolist()))
+    
+    matchup_count = num_assets * (num_assets - 1) // 2
+    print(f"✓ Tournament complete! Processed {matchup_count:,} matchups\n")
+    
+    # Every asset plays every other asset once
     results = {}
     for symbol in symbols:
+        symbol_wins = wins_by_symbol[symbol]
+        total = num_assets - 1
         results[symbol] = {
             'symbol': symbol,
-            'wins': 0,
-            'losses': 0,
-            'total_matchups': 0
+            'wins': symbol_wins,
+            'losses': total - symbol_wins,
+            'total_matchups': total
         }
+        
+        # Add individual MA data for tiebreaker
+        results[symbol].update(calculate_individual_ma_distance(assets_data[symbol]))
+        
+        # Calculate win rate
+        results[symbol]['win_rate'] = round((symbol_wins / total * 100), 1) if total > 0 else 0
     
-    # Run tournament (all pairwise matchups)
-    print(f"\n🏆 Running tournament with {len(symbols)} assets...")
-    print(f"Total matchups: {len(symbols) * (len(symbols) - 1):,}")
+    # Sort by wins (primary), then % above MA (tiebreaker), both descending.
+    # lexsort is stable, so full ties keep insertion order just like sorted(..., reverse=True)
+    entries = list(results.values())
+    order = np.lexsort((
+        -np.array([e['percent_above_ma'] for e in entries], dtype=np.float64),
+        -np.array([e['wins'] for e in entries], dtype=np.int64)
+    ))
     
-    matchup_count = 0
-    for asset_a in symbols:
-        for asset_b in symbols:
-            # Skip self-matchups
-            if asset_a == asset_b:
-                continue
-            
-            # CRITICAL: Only evaluate each pair once!
-            # Skip if we've already done this matchup (B vs A)
-            if asset_a > asset_b:
-                continue
-            
-            matchup_count += 1
-            if matchup_count % 10000 == 0:
-                print(f"Processed {matchup_count:,} matchups...")
-            
-            try:
-                if wins_matchup(assets_data[asset_a], assets_data[asset_b]):
-                    results[asset_a]['wins'] += 1
-                    results[asset_b]['losses'] += 1
-                else:
-                    results[asset_b]['wins'] += 1
-                    results[asset_a]['losses'] += 1
-                
-                results[asset_a]['total_matchups'] += 1
-                results[asset_b]['total_matchups'] += 1
-                
-            except Exception as e:
-                print(f"Error in matchup {asset_a} vs {asset_b}: {e}")
-                continue
-    
-    print(f"✓ Tournament complete! Processed {matchup_count:,} matchups\n")
+    # Add rank number - entry order[k] finishes k + 1
+    ranks = np.empty(len(entries), dtype=np.int64)
+    ranks[order] = np.arange(1, len(entries) + 1)
+    for entry, rank in zip(entries, ranks.tolist()):
+        entry['rank'] = rank
     
-    # Add individual MA data for tiebreaker
-    for symbol in symbols:
-        ma_data = calculate_individual_ma_distance(assets_data[symbol])
-        results[symbol].update(ma_data)
-        
-        # Calculate win rate
-        total = results[symbol]['total_matchups']
-        wins = results[symbol]['wins']
-        results[symbol]['win_rate'] = round((wins / total * 100), 1) if total > 0 else 0
-    
-    # Sort by wins (primary), then % above MA (tiebreaker)
-    ranked = sorted(
-        results.values(),
-        key=lambda x: (x['wins'], x['percent_above_ma']),
-        reverse=True
-    )
-    
-    # Add rank number
-    for i, asset in enumerate(ranked):
-        asset['rank'] = i + 1
-    
-    return ranked
+    return [entries[i] for i in order]
 
 def format_rankings_summary(rankings: List[Dict], top_n: int = 10) -> str:
     """Format top N rankings for display"""
@@ -0,0 +1,67 @@
+"""
+TTL Cache
+Small thread-safe LRU memoizer whose entries expire after a fixed time
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+_registry = []  # Every memoized function, so a refresh can drop them all
+
+def ttl_lru_cache(maxsize: int = 512, ttl: float = 3600):
+    """
+    Memoize a function (or method) for `ttl` seconds, keeping at most `maxsize` results
+
+    Calls are keyed on their arguments with defaults filled in, so
+    f('BTC') and f('BTC', 20) share an entry. A method's `self` is left
+    out of the key. Exceptions and empty results are never cached.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        skip_self = next(iter(signature.parameters), None) == 'self'
+        entries = OrderedDict()  # {key: (expires_at, value)}
+        lock = threading.Lock()
+
+        def make_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = tuple(bound.arguments.values())
+            return values[1:] if skip_self else values
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        entries.move_to_end(key)
+                        return entry[1]
+                    del entries[key]
+
+            value = func(*args, **kwargs)
+            if value:
+                with lock:
+                    entries[key] = (now + ttl, value)
+                    entries.move_to_end(key)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        _registry.append(wrapper)
+        return wrapper
+
+    return decorator
+
+def clear_all():
+    """Drop every memoized result (used when a refresh is explicitly requested)"""
+    for func in _registry:
+        func.cache_clear()